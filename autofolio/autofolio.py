@@ -1,5 +1,6 @@
 import logging
 import functools
+import os
 import traceback
 import random
 from itertools import tee
@@ -12,6 +13,7 @@ from ConfigSpace.configuration_space import Configuration, \
     ConfigurationSpace
 from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
     UniformFloatHyperparameter, UniformIntegerHyperparameter
+from ConfigSpace.conditions import InCondition
 
 # SMAC3
 from smac.tae.execute_func import ExecuteTAFunc
@@ -27,6 +29,8 @@ from autofolio.feature_preprocessing.pca import PCAWrapper
 from autofolio.feature_preprocessing.missing_values import ImputerWrapper
 from autofolio.feature_preprocessing.feature_group_filtering import FeatureGroupFiltering
 from autofolio.feature_preprocessing.standardscaler import StandardScalerWrapper
+from autofolio.feature_preprocessing.pipeline import FeaturePreprocessingPipeline
+from autofolio.feature_preprocessing.feature_step_selection import FeatureStepSelection
 
 # presolving
 from autofolio.pre_solving.aspeed_schedule import Aspeed
@@ -34,12 +38,19 @@ from autofolio.pre_solving.aspeed_schedule import Aspeed
 # classifiers
 from autofolio.selector.classifiers.random_forest import RandomForest
 
+# regressors
+from autofolio.selector.regressors.random_forest import RandomForestRegressor
+
 # selectors
 from autofolio.selector.pairwise_classification import PairwiseClassifier
+from autofolio.selector.per_algorithm_regression import PerAlgorithmRegressor
+from autofolio.selector.cost_sensitive_classification import CostSensitiveClassifier
 
 # validation
 from autofolio.validation.validate import Validator, Stats
 
+from autofolio.utils.lru_cache import LRUCache
+
 __author__ = "Marius Lindauer"
 __license__ = "BSD"
 __version__ = "2.0.0"
@@ -68,6 +79,19 @@ class AutoFolio(object):
 
         self.overwrite_args = None
 
+        # fitted feature preprocessing per CV fold (see get_tuned_config())
+        self.stage_cache = None
+
+        # number of threads to fit the selector
+        self.n_jobs = 1
+        # number of threads to build the trees of each random forest
+        # (None: default; see _get_tree_n_jobs())
+        self.tree_n_jobs = None
+        # fitted random forests (see get_tuned_config())
+        self.forest_cache = None
+        # early-terminating voting of PairwiseClassifier
+        self.tournament = False
+
     def run_cli(self):
         '''
             main method of AutoFolio based on command line interface
@@ -77,26 +101,36 @@ class AutoFolio(object):
         args_, self.overwrite_args = cmd_parser.parse()
 
         self._root_logger.setLevel(args_.verbose)
+        self.n_jobs = args_.n_jobs
+        self.tree_n_jobs = args_.tree_n_jobs
+        self.tournament = args_.tournament
 
         if args_.load:
             self.read_model_and_predict(
                 model_fn=args_.load, feature_vec=list(map(float, args_.feature_vec)))
         else:
 
-            scenario = ASlibScenario()
+            scenario = ASlibScenario(dtype=args_.precision)
             if args_.scenario:
-                scenario.read_scenario(args_.scenario)
+                scenario.read_scenario(
+                    dn=args_.scenario, cache_dn=args_.scenario_cache)
             elif args_.performance_csv and args_.feature_csv:
                 scenario.read_from_csv(perf_fn=args_.performance_csv,
                                        feat_fn=args_.feature_csv,
                                        objective=args_.objective,
                                        runtime_cutoff=args_.runtime_cutoff,
-                                       maximize=args_.maximize)
+                                       maximize=args_.maximize,
+                                       fold_column=args_.fold_column)
 
-            self.cs = self.get_cs(scenario)
+            # a plain cross validation estimates the feature steps per fold (see run_cv())
+            self.cs = self.get_cs(
+                scenario, feature_step_selection=args_.feature_step_selection and
+                bool(args_.tune or args_.save))
 
             if args_.tune:
-                config = self.get_tuned_config(scenario)
+                config = self.get_tuned_config(
+                    scenario, stage_cache_mb=args_.stage_cache_mb,
+                    forest_cache_mb=args_.forest_cache_mb)
             else:
                 config = self.cs.get_default_configuration()
             self.logger.debug(config)
@@ -107,7 +141,9 @@ class AutoFolio(object):
                 self._save_model(
                     args_.save, scenario, feature_pre_pipeline, pre_solver, selector, config)
             else:
-                self.run_cv(config=config, scenario=scenario, folds=10)
+                self.run_cv(config=config, scenario=scenario,
+                            progressive=args_.progressive,
+                            feature_step_selection=args_.feature_step_selection and not args_.tune)
 
     def _save_model(self, out_fn: str, scenario: ASlibScenario, feature_pre_pipeline: list, pre_solver: Aspeed, selector, config: Configuration):
         '''
@@ -131,6 +167,8 @@ class AutoFolio(object):
         scenario.logger = None
         for fpp in feature_pre_pipeline:
             fpp.logger = None
+            for stage in getattr(fpp, "stages", []):
+                stage.logger = None
         if pre_solver:
             pre_solver.logger = None
         selector.logger = None
@@ -155,12 +193,22 @@ class AutoFolio(object):
 
         for fpp in feature_pre_pipeline:
             fpp.logger = logging.getLogger("Feature Preprocessing")
+            for stage in getattr(fpp, "stages", []):
+                stage.logger = logging.getLogger("Feature Preprocessing")
         if pre_solver:
             pre_solver.logger = logging.getLogger("Aspeed PreSolving")
         selector.logger = logging.getLogger("Selector")
+        # single instance: per-call overhead of the classifiers dominates
+        if isinstance(selector, PairwiseClassifier):
+            selector.fast_predict = True
+            selector.tournament = self.tournament
+        elif isinstance(selector, CostSensitiveClassifier):
+            selector.fast_predict = True
 
         # saved scenario is adapted to given feature vector
-        feature_vec = np.array([feature_vec])
+        # (models saved before precision was configurable are float64)
+        feature_vec = np.array(
+            [feature_vec], dtype=getattr(scenario, "dtype", np.float64))
         scenario.feature_data = pd.DataFrame(
             feature_vec, index=["pseudo_instance"], columns=scenario.feature_names)
         scenario.instances = ["pseudo_instance"]
@@ -170,7 +218,7 @@ class AutoFolio(object):
         print("Selected Schedule [(algorithm, budget)]: %s" % (
             pred["pseudo_instance"]))
 
-    def get_cs(self, scenario: ASlibScenario):
+    def get_cs(self, scenario: ASlibScenario, feature_step_selection: bool=False):
         '''
             returns the parameter configuration space of AutoFolio
             (based on the automl config space: https://github.com/automl/ConfigSpace)
@@ -179,15 +227,30 @@ class AutoFolio(object):
             ---------
             scenario: autofolio.data.aslib_scenario.ASlibScenario
                 aslib scenario at hand
+            feature_step_selection: bool
+                if True, the default feature steps are estimated from the feature costs
+                and dominated combinations of feature steps are forbidden
+                (see FeatureStepSelection)
         '''
 
         self.cs = ConfigurationSpace()
 
+        default_steps = scenario.feature_steps_default
+        fss = None
+        if feature_step_selection:
+            fss = FeatureStepSelection()
+            if fss.fit(scenario):
+                default_steps = fss.default_steps
+            else:
+                fss = None
+
         # add feature steps as binary parameters
         for fs in scenario.feature_steps:
             fs_param = CategoricalHyperparameter(name="fgroup_%s" % (
-                fs), choices=[True, False], default=fs in scenario.feature_steps_default)
+                fs), choices=[True, False], default=fs in default_steps)
             self.cs.add_hyperparameter(fs_param)
+        if fss:
+            fss.add_forbiddens(cs=self.cs, steps=scenario.feature_steps)
 
         # preprocessing
         PCAWrapper.add_params(self.cs)
@@ -199,15 +262,37 @@ class AutoFolio(object):
             Aspeed.add_params(
                 cs=self.cs, cutoff=scenario.algorithm_cutoff_time)
 
+        # choices of classifiers, regressors and selectors are defined once here,
+        # since the choices of a hyperparameter cannot be extended afterwards
+        self.cs.add_hyperparameter(CategoricalHyperparameter(
+            "classifier", choices=["RandomForest"], default="RandomForest"))
+        self.cs.add_hyperparameter(CategoricalHyperparameter(
+            "regressor", choices=["RandomForestRegressor"], default="RandomForestRegressor"))
+        self.cs.add_hyperparameter(CategoricalHyperparameter(
+            "selector", choices=["PairwiseClassifier", "PerAlgorithmRegressor", "CostSensitiveClassifier"],
+            default="PairwiseClassifier"))
+
         # classifiers
         RandomForest.add_params(self.cs)
 
+        # regressors
+        RandomForestRegressor.add_params(self.cs)
+
         # selectors
         PairwiseClassifier.add_params(self.cs)
+        PerAlgorithmRegressor.add_params(self.cs)
+        CostSensitiveClassifier.add_params(self.cs)
+
+        # classifiers and regressors are only active for the selectors using them
+        selector = self.cs.get_hyperparameter("selector")
+        self.cs.add_condition(InCondition(child=self.cs.get_hyperparameter("classifier"),
+                                          parent=selector, values=["PairwiseClassifier", "CostSensitiveClassifier"]))
+        self.cs.add_condition(InCondition(child=self.cs.get_hyperparameter("regressor"),
+                                          parent=selector, values=["PerAlgorithmRegressor"]))
 
         return self.cs
 
-    def get_tuned_config(self, scenario: ASlibScenario):
+    def get_tuned_config(self, scenario: ASlibScenario, stage_cache_mb: int=1024, forest_cache_mb: int=1024):
         '''
             uses SMAC3 to determine a well-performing configuration in the configuration space self.cs on the given scenario
 
@@ -215,6 +300,12 @@ class AutoFolio(object):
             ---------
             scenario: ASlibScenario
                 ASlib Scenario at hand
+            stage_cache_mb: int
+                memory bound (in MB) of the cache of fitted feature preprocessing
+                per CV fold (shared by all evaluated configurations); 0 disables it
+            forest_cache_mb: int
+                memory bound (in MB) of the cache of fitted random forests
+                (see RandomForest.fit()); 0 disables it
 
             Returns
             -------
@@ -242,14 +333,29 @@ class AutoFolio(object):
             ">>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>")
         smbo = SMBO(scenario=ac_scenario, tae_runner=taf,
                     rng=np.random.RandomState(42))
-        smbo.run(max_iters=999)
+        if stage_cache_mb > 0:
+            self.stage_cache = LRUCache(max_bytes=stage_cache_mb * 2**20)
+        if forest_cache_mb > 0:
+            self.forest_cache = LRUCache(max_bytes=forest_cache_mb * 2**20)
+        try:
+            smbo.run(max_iters=999)
+        finally:
+            if self.stage_cache is not None:
+                self.logger.info("Feature preprocessing cache: %d hits, %d misses" % (
+                    self.stage_cache.hits, self.stage_cache.misses))
+                self.stage_cache = None
+            if self.forest_cache is not None:
+                self.logger.info("Random forest cache: %d hits, %d misses" % (
+                    self.forest_cache.hits, self.forest_cache.misses))
+                self.forest_cache = None
 
         AC_Stats.print_stats()
         self.logger.info("Final Incumbent: %s" % (smbo.incumbent))
 
         return smbo.incumbent
 
-    def run_cv(self, config: Configuration, scenario: ASlibScenario, folds=10):
+    def run_cv(self, config: Configuration, scenario: ASlibScenario, folds: list=None, progressive: bool=False,
+               feature_step_selection: bool=False):
         '''
             run a cross fold validation based on the given data from cv.arff
 
@@ -259,28 +365,50 @@ class AutoFolio(object):
                 aslib scenario at hand
             config: Configuration
                 parameter configuration to use for preprocessing
-            folds: int
-                number of cv-splits
+            folds: list
+                cv folds to evaluate;
+                if None, all folds of scenario.cv_data
+            progressive: bool
+                use predict_progressive() and validate with the feature steps
+                computed per instance (runtime scenarios)
+            feature_step_selection: bool
+                replace the feature steps of config by the default feature steps
+                estimated on the training instances of each fold (see _get_fold_config())
         '''
         try:
             if scenario.performance_type[0] == "runtime":
                 cv_stat = Stats(runtime_cutoff=scenario.algorithm_cutoff_time)
             else:
                 cv_stat = Stats(runtime_cutoff=0)
-            for i in range(1, folds + 1):
+            if folds is None:
+                if scenario.cv_data is None:
+                    scenario.create_cv_splits()
+                folds = sorted(scenario.cv_data["fold"].unique())
+            for i in map(int, folds):
                 self.logger.info("CV-Iteration: %d" % (i))
                 test_scenario, training_scenario = scenario.get_split(indx=i)
 
-                feature_pre_pipeline, pre_solver, selector = self.fit(
-                    scenario=training_scenario, config=config)
+                fold_config = config
+                if feature_step_selection:
+                    fold_config = self._get_fold_config(training_scenario, config)
 
-                schedules = self.predict(
-                    test_scenario, config, feature_pre_pipeline, pre_solver, selector)
+                feature_pre_pipeline, pre_solver, selector = self.fit(
+                    scenario=training_scenario, config=fold_config, fold=i)
+
+                used_steps = None
+                if progressive:
+                    step_order = self.get_feature_step_order(
+                        training_scenario, feature_pre_pipeline[0].fgf.active_groups)
+                    schedules, used_steps = self.predict_progressive(
+                        test_scenario, fold_config, feature_pre_pipeline, pre_solver, selector, step_order)
+                else:
+                    schedules = self.predict(
+                        test_scenario, fold_config, feature_pre_pipeline, pre_solver, selector)
 
                 val = Validator()
                 if scenario.performance_type[0] == "runtime":
                     stats = val.validate_runtime(
-                        schedules=schedules, test_scenario=test_scenario)
+                        schedules=schedules, test_scenario=test_scenario, used_steps=used_steps)
                 elif scenario.performance_type[0] == "solution_quality":
                     stats = val.validate_quality(
                         schedules=schedules, test_scenario=test_scenario)
@@ -303,7 +431,37 @@ class AutoFolio(object):
 
         return par10
 
-    def fit(self, scenario: ASlibScenario, config: Configuration):
+    def _get_fold_config(self, training_scenario: ASlibScenario, config: Configuration):
+        '''
+            estimates the default feature steps (see FeatureStepSelection)
+            on the training instances of a cv fold only,
+            such that the test instances do not leak into the choice of the feature steps
+
+            Arguments
+            ---------
+            training_scenario: autofolio.data.aslib_scenario.ASlibScenario
+                training split of a cv fold
+            config: Configuration
+                parameter configuration
+
+            Returns
+            -------
+            Configuration
+                config with the estimated feature steps
+                (in the configuration space of the fold)
+        '''
+        cs = self.cs
+        try:
+            fold_cs = self.get_cs(training_scenario, feature_step_selection=True)
+        finally:
+            self.cs = cs
+        default = fold_cs.get_default_configuration()
+        values = config.get_dictionary()
+        for step in training_scenario.feature_steps:
+            values["fgroup_%s" % (step)] = default["fgroup_%s" % (step)]
+        return Configuration(fold_cs, values=values)
+
+    def fit(self, scenario: ASlibScenario, config: Configuration, fold: int=None):
         '''
             fit AutoFolio on given ASlib Scenario
 
@@ -313,6 +471,9 @@ class AutoFolio(object):
                 aslib scenario at hand
             config: Configuration
                 parameter configuration to use for preprocessing
+            fold: int
+                index of the CV fold if scenario is a training split;
+                used as part of the key of self.stage_cache
 
             Returns
             -------
@@ -328,7 +489,7 @@ class AutoFolio(object):
             self.logger.info("Overwritten Configuration: %s" % (config))
 
         scenario, feature_pre_pipeline = self.fit_transform_feature_preprocessing(
-            scenario, config)
+            scenario, config, fold=fold)
 
         pre_solver = self.fit_pre_solving(scenario, config)
 
@@ -377,9 +538,12 @@ class AutoFolio(object):
 
         return config
 
-    def fit_transform_feature_preprocessing(self, scenario: ASlibScenario, config: Configuration):
+    def fit_transform_feature_preprocessing(self, scenario: ASlibScenario, config: Configuration, fold: int=None):
         '''
-            performs feature preprocessing on a given ASlib scenario wrt to a given configuration
+            performs feature preprocessing on a given ASlib scenario wrt to a given configuration;
+            if self.stage_cache is enabled and the fold is given,
+            the fitted preprocessing and the transformed features are reused
+            for all configurations with the same preprocessing settings
 
             Arguments
             ---------
@@ -387,26 +551,55 @@ class AutoFolio(object):
                 aslib scenario at hand
             config: Configuration
                 parameter configuration to use for preprocessing
+            fold: int
+                index of the CV fold if scenario is a training split
 
             Returns
             -------
                 list of fitted feature preproccessing objects
         '''
 
-        pipeline = []
-        fgf = FeatureGroupFiltering()
-        scenario = fgf.fit_transform(scenario, config)
+        cache_key = None
+        if self.stage_cache is not None and fold is not None:
+            cache_key = self._get_stage_cache_key(config=config, fold=fold)
+            cached = self.stage_cache.get(cache_key)
+            if cached is not None:
+                pipeline, feature_data = cached
+                # cached data frames are shared and never changed in place
+                scenario.feature_data = feature_data
+                scenario.used_feature_groups = pipeline.fgf.active_groups
+                return scenario, [pipeline]
+
+        pipeline = FeaturePreprocessingPipeline()
+        scenario = pipeline.fit_transform(scenario, config)
 
-        imputer = ImputerWrapper()
-        scenario = imputer.fit_transform(scenario, config)
+        if cache_key is not None:
+            self.stage_cache.put(cache_key, (pipeline, scenario.feature_data),
+                                 nbytes=scenario.feature_data.values.nbytes)
 
-        scaler = StandardScalerWrapper()
-        scenario = scaler.fit_transform(scenario, config)
+        return scenario, [pipeline]
 
-        pca = PCAWrapper()
-        scenario = pca.fit_transform(scenario, config)
+    def _get_stage_cache_key(self, config: Configuration, fold: int):
+        '''
+            returns the key of the fitted feature preprocessing in self.stage_cache,
+            i.e., the fold and all parameters of the feature preprocessing
+
+            Arguments
+            ---------
+            config: Configuration
+                parameter configuration
+            fold: int
+                index of the CV fold
 
-        return scenario, [fgf, imputer, scaler, pca]
+            Returns
+            -------
+            tuple
+        '''
+        feature_groups = tuple(sorted(param for param in config
+                                      if param.startswith("fgroup_") and config[param]))
+        return (fold, feature_groups, config.get("imputer_strategy"),
+                config.get("StandardScaler"), config.get("pca"),
+                config.get("pca_n_components"), config.get("pca_solver"))
 
     def fit_pre_solving(self, scenario: ASlibScenario, config: Configuration):
         '''
@@ -446,13 +639,62 @@ class AutoFolio(object):
 
             clf_class = None
             if config.get("classifier") == "RandomForest":
-                clf_class = RandomForest
+                clf_class = functools.partial(
+                    RandomForest, n_jobs=self._get_tree_n_jobs(self.n_jobs),
+                    forest_cache=self.forest_cache)
 
-            selector = PairwiseClassifier(classifier_class=clf_class)
+            selector = PairwiseClassifier(classifier_class=clf_class, n_jobs=self.n_jobs,
+                                          tournament=self.tournament)
+            selector.fit(scenario=scenario, config=config)
+
+        elif config.get("selector") == "PerAlgorithmRegressor":
+
+            reg_class = None
+            if config.get("regressor") == "RandomForestRegressor":
+                reg_class = functools.partial(
+                    RandomForestRegressor, n_jobs=self._get_tree_n_jobs(self.n_jobs))
+
+            selector = PerAlgorithmRegressor(regressor_class=reg_class, n_jobs=self.n_jobs)
+            selector.fit(scenario=scenario, config=config)
+
+        elif config.get("selector") == "CostSensitiveClassifier":
+
+            clf_class = None
+            if config.get("classifier") == "RandomForest":
+                clf_class = functools.partial(
+                    RandomForest, n_jobs=self._get_tree_n_jobs(1),
+                    forest_cache=self.forest_cache)
+
+            selector = CostSensitiveClassifier(classifier_class=clf_class)
             selector.fit(scenario=scenario, config=config)
 
         return selector
 
+    def _get_tree_n_jobs(self, n_jobs: int):
+        '''
+            number of threads to build the trees of each random forest
+            if n_jobs forests are fitted in parallel;
+            nested threads beyond the available cores oversubscribe the CPU,
+            so self.tree_n_jobs is capped at max(1, #cores // n_jobs)
+
+            Arguments
+            ---------
+            n_jobs: int
+                number of forests fitted in parallel
+
+            Returns
+            -------
+            tree_n_jobs: int
+        '''
+
+        max_tree_n_jobs = max(1, (os.cpu_count() or 1) // max(1, n_jobs))
+        if self.tree_n_jobs is None:
+            # nested parallelism only on request
+            return 1 if n_jobs > 1 else max_tree_n_jobs
+        if self.tree_n_jobs < 0:
+            return max_tree_n_jobs
+        return min(self.tree_n_jobs, max_tree_n_jobs)
+
     def predict(self, scenario: ASlibScenario, config: Configuration, feature_pre_pipeline: list, pre_solver: Aspeed, selector):
         '''
             predicts algorithm schedules wrt a given config
@@ -488,3 +730,92 @@ class AutoFolio(object):
             return dict((inst, pre_solving_schedule.get(inst, []) + schedule) for inst, schedule in pred_schedules.items())
         else:
             return pred_schedules
+
+    def get_feature_step_order(self, scenario: ASlibScenario, groups: list):
+        '''
+            orders feature steps by their mean cost such that
+            each step comes after the steps it requires
+
+            Arguments
+            ---------
+            scenario: autofolio.data.aslib_scenario.ASlibScenario
+                aslib scenario with feature costs (e.g., the training data)
+            groups: list
+                feature steps to order
+
+            Returns
+            -------
+            list
+                ordered feature steps
+        '''
+        if scenario.feature_cost_data is not None:
+            costs = scenario.feature_cost_data[groups].mean()
+        else:
+            costs = pd.Series(0, index=groups)
+
+        order = []
+        todo = list(groups)
+        while todo:
+            ready = [group for group in todo
+                     if all(req in order or req not in groups
+                            for req in scenario.feature_group_dict[group].get("requires") or [])]
+            # ready is not empty since the groups are closed under requirements
+            group = min(ready, key=lambda g: (costs[g], g))
+            order.append(group)
+            todo.remove(group)
+        return order
+
+    def predict_progressive(self, scenario: ASlibScenario, config: Configuration, feature_pre_pipeline: list, pre_solver: Aspeed, selector, step_order: list):
+        '''
+            predicts algorithm schedules wrt a given config and given pipelines
+            while computing the feature steps in the given order;
+            the selection of an instance stops as soon as
+            its remaining feature steps cannot change it.
+            Falls back to predict() (all steps per instance) if the features are projected by PCA
+            or the selector does not support partially known features.
+
+            Arguments
+            ---------
+            scenario: autofolio.data.aslib_scenario.ASlibScenario
+                aslib scenario at hand
+            config: Configuration
+                parameter configuration
+            feature_pre_pipeline: list
+                list of fitted feature preprocessors
+            pre_solver: Aspeed
+                pre solver object with a saved static schedule
+            selector: autofolio.selector.*
+                fitted selector object
+            step_order: list
+                active feature steps in the order of computation (see get_feature_step_order())
+
+            Returns
+            -------
+                schedules: {inst -> [(algorithm, budget)]}
+                used_steps: {inst -> list of computed feature steps}
+        '''
+        pipeline = feature_pre_pipeline[0]
+        if len(feature_pre_pipeline) != 1 or not isinstance(pipeline, FeaturePreprocessingPipeline) or \
+                pipeline.pca.pca or not hasattr(selector, "predict_progressive"):
+            self.logger.info("Progressive prediction not supported; compute all feature steps")
+            schedules = self.predict(scenario, config, feature_pre_pipeline, pre_solver, selector)
+            return schedules, dict((inst, list(step_order)) for inst in schedules)
+
+        self.logger.info("Predict on Test (progressive)")
+        scenario = pipeline.transform(scenario)
+
+        if pre_solver:
+            pre_solving_schedule = pre_solver.predict(scenario=scenario)
+        else:
+            pre_solving_schedule = {}
+
+        known_features = [pipeline.fgf.get_feature_mask(scenario, step_order[:k])
+                          for k in range(len(step_order) + 1)]
+        pred_schedules, n_steps = selector.predict_progressive(
+            scenario=scenario, known_features=known_features)
+        used_steps = dict((inst, step_order[:k]) for inst, k in n_steps.items())
+
+        # combine schedules
+        if pre_solving_schedule:
+            pred_schedules = dict((inst, pre_solving_schedule.get(inst, []) + schedule) for inst, schedule in pred_schedules.items())
+        return pred_schedules, used_steps
@@ -3,32 +3,118 @@ import sys
 import logging
 import yaml
 import functools
-import arff  # liac-arff
 import copy
+import hashlib
+import json
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 from sklearn.cross_validation import KFold
 import pandas as pd
 import numpy as np
 
+from autofolio.io.arff_reader import ARFFReader, ARFFError
+
 __author__ = "Marius Lindauer"
 __version__ = "2.0.0"
 __license__ = "BSD"
 
 MAXINT = 2**32
 
+# code table of runstatus_data and feature_runstatus_data (stored as int8 codes)
+RUNSTATUS = ["ok", "timeout", "memout", "not_applicable",
+             "crash", "other", "presolved", "unknown"]
+RUNSTATUS_CODE = dict((status, np.int8(code))
+                      for code, status in enumerate(RUNSTATUS))
+
+# increase whenever the layout of the binary scenario cache changes
+CACHE_VERSION = 3
+# data frames written as binary arrays to the scenario cache
+CACHE_FRAMES = ["feature_data", "runstatus_data", "feature_cost_data",
+                "feature_runstatus_data", "ground_truth_data", "cv_data"]
+# attributes which are not part of the cached meta data
+CACHE_EXCLUDE = ["logger", "read_funcs", "found_files", "dir_", "dtype",
+                 "performance_data", "performance_data_all", "_fold_index", "_shared",
+                 "feature_group_requires", "feature_group_indices",
+                 "feature_group_columns", "_feature_group_closure"]
+# data frames split into training and test data in get_split()
+SPLIT_FRAMES = ["feature_data", "performance_data", "runstatus_data",
+                "feature_runstatus_data", "feature_cost_data", "ground_truth_data"]
+# frames of shared stores attached in this process: (directory, name) -> data frame
+SHARED_FRAMES = {}
+
+
+def _to_json(obj):
+    '''
+        encodes the values of the cached meta data which json does not support
+        (sets and numpy scalars)
+    '''
+    if isinstance(obj, (set, frozenset)):
+        return {"__set__": list(obj)}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError("%s is not JSON serializable" % (type(obj).__name__))
+
+
+def _from_json(obj: dict):
+    '''
+        decodes the sets encoded by _to_json()
+    '''
+    if list(obj) == ["__set__"]:
+        return set(obj["__set__"])
+    return obj
+
+
+def _remove_shared_store(shared_dn: str, names: list, pid: int):
+    '''
+        forgets the attached frames of a shared store
+        and removes its directory if called in the creating process
+    '''
+    for name in names:
+        SHARED_FRAMES.pop((shared_dn, name), None)
+    if os.getpid() == pid:
+        # mapped pages stay valid after removing the files
+        shutil.rmtree(shared_dn, ignore_errors=True)
+
+
+class _SharedStore(object):
+    '''
+        handle of a temporary shared store (see ASlibScenario.share());
+        the store is removed by release() or as soon as no scenario refers to the handle
+        (at the latest at exit); the finalizer does not refer to any scenario
+    '''
+
+    def __init__(self, shared_dn: str, names: list):
+        self.dn = shared_dn
+        self._finalizer = weakref.finalize(
+            self, _remove_shared_store, shared_dn, list(names), os.getpid())
+
+    def release(self):
+        self._finalizer()
+
 
 class ASlibScenario(object):
     '''
         all data about an algorithm selection scenario
     '''
 
-    def __init__(self):
+    def __init__(self, dtype=np.float64):
         '''
             Constructor
+
+            Arguments
+            ---------
+            dtype: numpy.dtype
+                floating point precision of feature_data and performance_data_all
+                (e.g., np.float32 to halve the memory footprint)
         '''
 
         self.logger = logging.getLogger("ASlibScenario")
 
+        self.dtype = np.dtype(dtype)
+
         # listed in description.txt
         self.scenario = None  # string
         self.performance_measure = []  # list of strings
@@ -47,6 +133,12 @@ class ASlibScenario(object):
         self.feature_steps = []
         self.feature_steps_default = []
 
+        # see compile_feature_groups()
+        self.feature_group_requires = None  # string -> frozenset of strings
+        self.feature_group_indices = None  # string -> positions in feature_data
+        self.feature_group_columns = None  # columns of feature_data
+        self._feature_group_closure = {}
+
         # extracted in other files
         self.features = []
         self.ground_truths = {}  # type -> [values]
@@ -62,6 +154,15 @@ class ASlibScenario(object):
 
         self.instances = None  # list
 
+        # see get_fold_index()
+        self._fold_index = None
+
+        # changes after loading: list of ("instances" or "algorithms", [names])
+        self.updates = []
+
+        # see share()
+        self._shared = None
+
         self.found_files = []
         self.read_funcs = {
             "description.txt": self.read_description,
@@ -78,6 +179,7 @@ class ASlibScenario(object):
     def __getstate__(self):
         '''
             method for pickling the object;
+            data frames in the shared store (see share()) are replaced by their names
         '''
         #  state_dict = copy.copy(self.__dict__)
         state_dict = self.__dict__
@@ -85,9 +187,161 @@ class ASlibScenario(object):
         # adding explicitly the feature names as used before
         state_dict["feature_names"] = list(self.feature_data.columns)
 
+        if self._shared is None:
+            return state_dict
+
+        state_dict = dict(state_dict)
+        state_dict["performance_data_all"] = list(self.performance_data_all)
+        state_dict["_fold_index"] = None
+
+        # only data frames which were not replaced since share() are attached by name
+        attached = []
+        for slot in self._get_frame_slots():
+            data = self._get_frame(slot)
+            for name, (shared_data, _) in self._shared["frames"].items():
+                if data is shared_data:
+                    attached.append((slot, name))
+                    self._set_frame(slot, None, state_dict)
+                    break
+
+        # copies never remove the shared store
+        state_dict["_shared"] = {
+            "dn": self._shared["dn"],
+            "owner": False,
+            "store": None,
+            "frames": dict((name, (None, frame_meta))
+                           for name, (_, frame_meta) in self._shared["frames"].items()),
+            "attached": attached}
         return state_dict
 
-    def read_from_csv(self, perf_fn: str, feat_fn: str, objective: str, runtime_cutoff: float, maximize: bool):
+    def __setstate__(self, state_dict: dict):
+        '''
+            method for unpickling the object;
+            attaches to the data frames in the shared store (see share())
+        '''
+        self.__dict__.update(state_dict)
+
+        shared = self.__dict__.get("_shared")
+        if shared is None or "attached" not in shared:
+            return
+
+        frames = {}
+        for name, (_, frame_meta) in shared["frames"].items():
+            data = SHARED_FRAMES.get((shared["dn"], name))
+            if data is None:
+                data = self._load_frame(shared["dn"], name, frame_meta)
+                SHARED_FRAMES[(shared["dn"], name)] = data
+            frames[name] = (data, frame_meta)
+
+        for slot, name in shared["attached"]:
+            self._set_frame(slot, frames[name][0])
+
+        self._shared = {"dn": shared["dn"],
+                        "owner": shared["owner"],
+                        "store": shared["store"],
+                        "frames": frames}
+
+    def _get_frame_slots(self):
+        '''
+            returns all places of data frames in the scenario
+
+            Returns
+            -------
+            list
+                (attribute name, position in list or None)
+        '''
+        slots = [(name, None) for name in CACHE_FRAMES + ["performance_data"]]
+        slots.extend(("performance_data_all", i)
+                     for i in range(len(self.performance_data_all)))
+        return slots
+
+    def _get_frame(self, slot: tuple):
+        name, i = slot
+        if i is None:
+            return getattr(self, name)
+        return getattr(self, name)[i]
+
+    def _set_frame(self, slot: tuple, data, state_dict: dict=None):
+        name, i = slot
+        if state_dict is None:
+            state_dict = self.__dict__
+        if i is None:
+            state_dict[name] = data
+        else:
+            state_dict[name][i] = data
+
+    def share(self, shared_dn: str=None):
+        '''
+            moves all data frames into a shared store of memory-mapped numpy arrays;
+            afterwards, pickling the scenario (e.g., to send it to worker processes)
+            serializes only the meta data and the names of the arrays;
+            workers attach to the arrays (once per process) without copying them,
+            i.e., the memory consumption does not grow with the number of workers.
+            Data frames replaced later on (e.g., by add_instances())
+            are pickled as usual.
+
+            Arguments
+            ---------
+            shared_dn: str
+                directory of the shared store;
+                if None, a temporary directory is created in /dev/shm (if available)
+                which is removed by release_shared() of this scenario
+                or as soon as neither this scenario nor its splits (see get_split())
+                are referenced anymore (at the latest at exit)
+        '''
+        temporary = shared_dn is None
+        if temporary:
+            tmp_dn = "/dev/shm" if os.path.isdir("/dev/shm") else None
+            shared_dn = tempfile.mkdtemp(prefix="autofolio_", dir=tmp_dn)
+        elif not os.path.isdir(shared_dn):
+            os.makedirs(shared_dn)
+
+        self.logger.info("Share scenario data in %s" % (shared_dn))
+
+        frames = {}
+        for slot in self._get_frame_slots():
+            data = self._get_frame(slot)
+            if data is None:
+                continue
+            # the same data frame can be in several places (e.g., performance_data)
+            for name, (shared_data, _) in frames.items():
+                if data is shared_data:
+                    break
+            else:
+                name = slot[0] if slot[1] is None else "%s_%d" % slot
+                frame_meta = self._save_frame(shared_dn, name, data)
+                shared_data = self._load_frame(shared_dn, name, frame_meta)
+                SHARED_FRAMES[(shared_dn, name)] = shared_data
+                frames[name] = (data, frame_meta)
+            self._set_frame(slot, SHARED_FRAMES[(shared_dn, name)])
+
+        self._shared = {"dn": shared_dn,
+                        # release_shared() removes the temporary store
+                        "owner": temporary,
+                        # keeps the temporary store alive (shared with the splits)
+                        "store": _SharedStore(shared_dn, frames) if temporary else None,
+                        "frames": dict((name, (SHARED_FRAMES[(shared_dn, name)], frame_meta))
+                                       for name, (_, frame_meta) in frames.items())}
+        self._fold_index = None
+
+    def release_shared(self):
+        '''
+            detaches from the shared store (see share());
+            the data frames stay valid but are pickled as usual afterwards;
+            a temporary store is removed if this scenario created it
+            (and this process created the store)
+        '''
+        if self._shared is None:
+            return
+        if self._shared["owner"]:
+            self._shared["store"].release()
+        elif self._shared["store"] is None:
+            for name in self._shared["frames"]:
+                SHARED_FRAMES.pop((self._shared["dn"], name), None)
+        self._shared = None
+
+    def read_from_csv(self, perf_fn: str, feat_fn: str, objective: str, runtime_cutoff: float, maximize: bool,
+                      fold_column: str=None):
         '''
             create an internal ASlib scenario from csv
 
@@ -103,6 +357,10 @@ class ASlibScenario(object):
                 maximal runtime cutoff
             maximize: bool
                 whether to maximize or minimize the objective values
+            fold_column: str
+                name of a column in the feature file with a precomputed cv fold of each instance
+                (integral values; renumbered to 1..k);
+                if None, 10 cv folds are created
         '''
 
         self.scenario = None  # string
@@ -115,8 +373,10 @@ class ASlibScenario(object):
         self.features_cutoff_time = None  # float
         self.features_cutoff_memory = None  # integer
 
-        self.feature_data = pd.read_csv(feat_fn, index_col=0)
-        self.performance_data = pd.read_csv(perf_fn, index_col=0)
+        self.feature_data, folds = self._read_csv_matrix(
+            fn=feat_fn, extra_column=fold_column)
+        self.performance_data, _ = self._read_csv_matrix(fn=perf_fn)
+        self.performance_data_all = [self.performance_data]
 
         self.algorithms = list(
             self.performance_data.columns)  # list of strings
@@ -133,18 +393,18 @@ class ASlibScenario(object):
 
         self.instances = list(self.feature_data.index)  # lis
 
+        status = np.full(self.performance_data.shape,
+                         RUNSTATUS_CODE["ok"], dtype=np.int8)
+        if objective == "runtime":
+            status[self.performance_data.values >= runtime_cutoff] = RUNSTATUS_CODE["timeout"]
         self.runstatus_data = pd.DataFrame(
-            data=np.array(
-                [["ok"] * len(self.algorithms)] * len(self.instances)),
+            data=status,
             index=self.performance_data.index,
             columns=self.performance_data.columns)
 
-        if objective == "runtime":
-            self.runstatus_data[
-                self.performance_data >= runtime_cutoff] = "timeout"
-
         self.feature_runstatus_data = pd.DataFrame(
-            data=["ok"] * len(self.instances), index=self.instances, columns=["all"])
+            data=np.full((len(self.instances), 1), RUNSTATUS_CODE["ok"], dtype=np.int8),
+            index=self.instances, columns=["all"])
 
         self.feature_cost_data = None
         self.ground_truth_data = None
@@ -153,12 +413,106 @@ class ASlibScenario(object):
         self.features = self.features_deterministic
         self.ground_truths = {}  # type -> [values]
 
-        self.create_cv_splits()
+        if folds is None:
+            self.create_cv_splits()
+        else:
+            self.cv_data = pd.DataFrame(
+                {"fold": self._get_folds(folds, fold_column, feat_fn)}, index=folds.index)
 
         if self.CHECK_VALID:
             self.check_data()
 
-    def read_scenario(self, dn):
+        self.compile_feature_groups()
+
+    def _get_folds(self, folds: pd.Series, fold_column: str, fn: str):
+        '''
+            checks a precomputed cv fold column and renumbers its folds to 1..k
+            (as in cv.arff and as expected by get_split())
+
+            Arguments
+            ---------
+            folds: pandas.Series
+                fold of each instance
+            fold_column: str
+                name of the fold column
+            fn: str
+                file name of the feature csv
+
+            Returns
+            -------
+            numpy.array
+                folds in 1..k
+        '''
+        values = folds.values
+        if np.isnan(values).any() or (values != np.round(values)).any():
+            self.logger.error(
+                "Column \"%s\" in %s has to provide an integral cv fold for each instance" % (fold_column, fn))
+            sys.exit(3)
+        fold_values = np.unique(values)
+        if len(fold_values) < 2:
+            self.logger.error(
+                "Column \"%s\" in %s has to provide at least 2 cv folds" % (fold_column, fn))
+            sys.exit(3)
+        if not np.array_equal(fold_values, np.arange(1, len(fold_values) + 1)):
+            self.logger.warning("Renumber cv folds %s of column \"%s\" to 1..%d" % (
+                fold_values.astype(int).tolist(), fold_column, len(fold_values)))
+        return np.searchsorted(fold_values, values) + 1.
+
+    def _read_csv_matrix(self, fn: str, extra_column: str=None, chunksize: int=2**16):
+        '''
+            reads a csv table (first column: instance names, all other columns: numeric values)
+            in chunks into a matrix with precision self.dtype
+
+            Arguments
+            ---------
+            fn: str
+                file name of csv table
+            extra_column: str
+                name of a numeric column which is not part of the matrix
+            chunksize: int
+                number of lines parsed at once
+
+            Returns
+            -------
+            pandas.DataFrame
+                matrix (row: instance)
+            pandas.Series
+                values of extra_column (None if extra_column is None)
+        '''
+        header = pd.read_csv(fn, nrows=0)
+        index_col = header.columns[0]
+        columns = [col for col in header.columns[1:] if col != extra_column]
+        if extra_column and extra_column not in header.columns:
+            self.logger.error("Column \"%s\" not found in %s" % (extra_column, fn))
+            sys.exit(3)
+
+        # explicit dtypes: no type inference of pandas
+        dtype = dict((col, self.dtype) for col in columns)
+        dtype[index_col] = object
+        if extra_column:
+            dtype[extra_column] = np.float64
+
+        buf = np.full((1024, len(columns)), np.nan, dtype=self.dtype)
+        extra = np.full((1024, 1), np.nan) if extra_column else None
+        index = []
+        n_rows = 0
+        for chunk in pd.read_csv(fn, dtype=dtype, chunksize=chunksize):
+            shape = (n_rows + chunk.shape[0], len(columns))
+            buf = self._grow(buf, shape, np.nan)
+            buf[n_rows:shape[0]] = chunk[columns].values
+            if extra_column:
+                extra = self._grow(extra, (shape[0], 1), np.nan)
+                extra[n_rows:shape[0], 0] = chunk[extra_column].values
+            index.append(chunk[index_col].values)
+            n_rows = shape[0]
+
+        index = np.concatenate(index) if index else np.array([], dtype=object)
+        data = pd.DataFrame(buf[:n_rows], index=index, columns=columns, copy=False)
+        if extra_column:
+            return data, pd.Series(extra[:n_rows, 0], index=index)
+        return data, None
+
+    def read_scenario(self, dn, cache_dn: str=None, n_jobs: int=None):
         '''
             read an ASlib scenario from disk
 
@@ -166,17 +520,31 @@ class ASlibScenario(object):
             ---------
             dn: str
                 directory name with ASlib files
+            cache_dn: str
+                directory of the binary scenario cache;
+                if None, the cache is not used
+            n_jobs: int
+                number of threads to read files (see read_files())
         '''
         self.logger.info("Read ASlib scenario: %s" % (dn))
 
         # add command line arguments in metainfo
         self.dir_ = dn
         self.find_files()
-        self.read_files()
+
+        if cache_dn:
+            cache_key = self.get_cache_key()
+            if not self.read_cache(cache_dn=cache_dn, cache_key=cache_key):
+                self.read_files(n_jobs=n_jobs)
+                self.write_cache(cache_dn=cache_dn, cache_key=cache_key)
+        else:
+            self.read_files(n_jobs=n_jobs)
 
         if self.CHECK_VALID:
             self.check_data()
 
+        self.compile_feature_groups()
+
     def find_files(self):
         '''
             find all expected files in self.dir_
@@ -201,15 +569,234 @@ class ASlibScenario(object):
             else:
                 self.found_files.append(full_path)
 
-    def read_files(self):
+    def read_files(self, n_jobs: int=None):
         '''
             iterates over all found files (self.found_files) and 
-            calls the corresponding function to validate file
+            calls the corresponding function to validate file;
+            description.txt is read first since all other files depend on it;
+            afterwards, all other files are read concurrently
+            (the parsing of ARFFReader runs mostly in the C parser of pandas,
+            which releases the GIL)
+
+            Arguments
+            ---------
+            n_jobs: int
+                number of threads to read files;
+                if None, one thread per file but at most one per CPU
         '''
+        read_jobs = []
         for file_ in self.found_files:
             read_func = self.read_funcs.get(os.path.basename(file_))
-            if read_func:
+            if read_func == self.read_description:
                 read_func(file_)
+            elif read_func:
+                read_jobs.append((read_func, file_))
+
+        if n_jobs is None:
+            n_jobs = min(len(read_jobs), os.cpu_count() or 1)
+        if n_jobs <= 1 or len(read_jobs) < 2:
+            for read_func, file_ in read_jobs:
+                read_func(file_)
+            return
+
+        # each read function sets its own attributes
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [pool.submit(read_func, file_)
+                       for read_func, file_ in read_jobs]
+            for future in futures:
+                # re-raises exceptions (incl. sys.exit) of the readers
+                future.result()
+
+    def get_cache_key(self):
+        '''
+            computes a hash of the content of all found files (self.found_files)
+            and of the floating point precision (self.dtype);
+            used as key of the binary scenario cache
+
+            Returns
+            -------
+            str
+                hex digest of the hash
+        '''
+        sha1 = hashlib.sha1()
+        sha1.update(str(CACHE_VERSION).encode("utf-8"))
+        sha1.update(str(self.dtype).encode("utf-8"))
+        for file_ in sorted(self.found_files):
+            sha1.update(os.path.basename(file_).encode("utf-8"))
+            with open(file_, "rb") as fp:
+                for block in iter(functools.partial(fp.read, 2**20), b""):
+                    sha1.update(block)
+        return sha1.hexdigest()
+
+    def write_cache(self, cache_dn: str, cache_key: str):
+        '''
+            writes all parsed data frames as binary numpy arrays
+            and all meta data (e.g., from description.txt) to <cache_dn>/<cache_key>
+
+            Arguments
+            ---------
+            cache_dn: str
+                directory of the binary scenario cache
+            cache_key: str
+                hash of the scenario files (see get_cache_key())
+        '''
+        out_dn = os.path.join(cache_dn, cache_key)
+        tmp_dn = "%s.tmp%d" % (out_dn, os.getpid())
+        self.logger.info("Write scenario cache: %s" % (out_dn))
+
+        try:
+            os.makedirs(tmp_dn)
+            frames = [(name, getattr(self, name)) for name in CACHE_FRAMES]
+            frames.extend(("performance_data_all_%d" % (i), data)
+                          for i, data in enumerate(self.performance_data_all))
+
+            frame_meta = {}
+            for name, data in frames:
+                if data is None:
+                    continue
+                frame_meta[name] = self._save_frame(tmp_dn, name, data)
+
+            meta = dict((key, value) for key, value in self.__dict__.items()
+                        if key not in CACHE_EXCLUDE and key not in CACHE_FRAMES)
+            # no pickle: loading a (stale or manipulated) cache must not execute code
+            with open(os.path.join(tmp_dn, "meta.json"), "w") as fp:
+                json.dump({"meta": meta,
+                           "frames": frame_meta,
+                           "n_perf": len(self.performance_data_all)}, fp, default=_to_json)
+
+            os.rename(tmp_dn, out_dn)
+        except (OSError, TypeError, ValueError):
+            # e.g., read-only cache directory, another process was faster
+            # or meta data which cannot be stored as json
+            self.logger.warn("Could not write scenario cache: %s" % (out_dn))
+            shutil.rmtree(tmp_dn, ignore_errors=True)
+
+    def read_cache(self, cache_dn: str, cache_key: str):
+        '''
+            reads all data frames and meta data from <cache_dn>/<cache_key>;
+            numeric arrays are memory-mapped (copy-on-write)
+
+            Arguments
+            ---------
+            cache_dn: str
+                directory of the binary scenario cache
+            cache_key: str
+                hash of the scenario files (see get_cache_key())
+
+            Returns
+            -------
+            bool
+                True if the scenario was read from the cache
+        '''
+        in_dn = os.path.join(cache_dn, cache_key)
+        if not os.path.isfile(os.path.join(in_dn, "meta.json")):
+            self.logger.info("No scenario cache found: %s" % (in_dn))
+            return False
+
+        self.logger.info("Read scenario cache: %s" % (in_dn))
+
+        try:
+            with open(os.path.join(in_dn, "meta.json"), "r") as fp:
+                cache = json.load(fp, object_hook=_from_json)
+            frames = dict((name, self._load_frame(in_dn, name, frame_meta))
+                          for name, frame_meta in cache["frames"].items())
+            performance_data_all = [frames["performance_data_all_%d" % (i)]
+                                    for i in range(cache["n_perf"])]
+            meta = cache["meta"]
+        except Exception as e:
+            # any broken cache is a cache miss; it is replaced by write_cache()
+            self.logger.warn("Could not read scenario cache %s (%s) - remove it" % (in_dn, e))
+            shutil.rmtree(in_dn, ignore_errors=True)
+            return False
+
+        self.__dict__.update(meta)
+        for name in CACHE_FRAMES:
+            setattr(self, name, frames.get(name))
+        self.performance_data_all = performance_data_all
+        self.performance_data = self.performance_data_all[0]
+
+        return True
+
+    @staticmethod
+    def _save_frame(dn: str, name: str, data):
+        '''
+            saves the values of a data frame as binary numpy array <dn>/<name>.npy;
+            object values (e.g., ground truth) are saved as codes of a categorical
+            and the missing values as boolean mask <dn>/<name>.mask.npy
+
+            Arguments
+            ---------
+            dn: str
+                directory name
+            name: str
+                name of the data frame
+            data: pandas.DataFrame
+                data frame to save
+
+            Returns
+            -------
+            dict
+                json-compatible meta data (index, columns, dtypes and categories)
+                to restore the data frame (see _load_frame())
+        '''
+        values = data.values
+        frame_meta = {"index": data.index.tolist(),
+                      "index_name": data.index.name,
+                      "index_dtype": str(data.index.dtype),
+                      "columns": data.columns.tolist(),
+                      "columns_name": data.columns.name,
+                      "columns_dtype": str(data.columns.dtype),
+                      "dtype": str(values.dtype),
+                      "categories": None}
+        if values.dtype == object:
+            codes, uniques = pd.factorize(values.ravel())
+            missing = codes == -1
+            codes[missing] = 0
+            np.save(os.path.join(dn, "%s.mask.npy" % (name)), missing.reshape(values.shape))
+            frame_meta["categories"] = uniques.tolist()
+            values = codes.astype(np.int32).reshape(values.shape)
+        np.save(os.path.join(dn, "%s.npy" % (name)), values)
+        return frame_meta
+
+    @staticmethod
+    def _load_frame(dn: str, name: str, frame_meta: dict):
+        '''
+            loads a data frame saved by _save_frame();
+            numeric arrays are memory-mapped (copy-on-write), i.e.,
+            all processes loading the same file share its pages until they write to it;
+            missing object values are restored as NaN
+
+            Arguments
+            ---------
+            dn: str
+                directory name
+            name: str
+                name of the data frame
+            frame_meta: dict
+                meta data as returned by _save_frame()
+
+            Returns
+            -------
+            pandas.DataFrame
+        '''
+        values = np.load(os.path.join(dn, "%s.npy" % (name)), mmap_mode="c", allow_pickle=False)
+        dtype = None
+        if frame_meta["categories"] is not None:
+            dtype = object
+            # code 0 of missing values maps to an arbitrary category; overwritten by the mask
+            values = np.array(frame_meta["categories"] + [np.nan], dtype=object)[values]
+            values[np.load(os.path.join(dn, "%s.mask.npy" % (name)), allow_pickle=False)] = np.nan
+        elif str(values.dtype) != frame_meta["dtype"]:
+            raise ValueError("%s.npy has dtype %s instead of %s" % (
+                name, values.dtype, frame_meta["dtype"]))
+        index = pd.Index(frame_meta["index"], dtype=frame_meta["index_dtype"],
+                         name=frame_meta["index_name"])
+        columns = pd.Index(frame_meta["columns"], dtype=frame_meta["columns_dtype"],
+                           name=frame_meta["columns_name"])
+        if values.shape != (len(index), len(columns)):
+            raise ValueError("%s.npy has shape %s instead of %s" % (
+                name, values.shape, (len(index), len(columns))))
+        return pd.DataFrame(data=values, index=index, columns=columns, dtype=dtype, copy=False)
 
     def read_description(self, fn):
         '''
@@ -329,62 +916,176 @@ class ASlibScenario(object):
         '''
         self.logger.info("Read %s" % (fn))
 
-        with open(fn, "r") as fp:
-            try:
-                arff_dict = arff.load(fp)
-            except arff.BadNominalValue:
-                self.logger.error(
-                    "Parsing of arff file failed (%s) - maybe conflict of header and data." % (file_))
+        try:
+            reader = ARFFReader(fn)
+        except ARFFError as e:
+            self.logger.error(
+                "Parsing of arff file failed (%s) - %s" % (fn, e))
+            sys.exit(3)
 
-        if arff_dict["attributes"][0][0].upper() != "INSTANCE_ID":
+        attributes = reader.attributes
+        if attributes[0][0].upper() != "INSTANCE_ID":
             self.logger.error(
-                "instance_id as first attribute is missing in %s" % (file_))
+                "instance_id as first attribute is missing in %s" % (fn))
             sys.exit(3)
-        if arff_dict["attributes"][1][0].upper() != "REPETITION":
+        if attributes[1][0].upper() != "REPETITION":
             self.logger.error(
-                "repetition as second attribute is missing in %s" % (file_))
+                "repetition as second attribute is missing in %s" % (fn))
             sys.exit(3)
-        if arff_dict["attributes"][2][0].upper() != "ALGORITHM":
+        if attributes[2][0].upper() != "ALGORITHM":
             self.logger.error(
-                "algorithm as third attribute is missing in %s" % (file_))
+                "algorithm as third attribute is missing in %s" % (fn))
             sys.exit(3)
 
         i = 0
         for performance_measure in self.performance_measure:
-            if arff_dict["attributes"][3 + i][0].upper() != performance_measure.upper():
+            if attributes[3 + i][0].upper() != performance_measure.upper():
                 self.logger.error(
-                    "\"%s\" as attribute is missing in %s" % (performance_measure, file_))
+                    "\"%s\" as attribute is missing in %s" % (performance_measure, fn))
                 sys.exit(3)
             i += 1
 
-        if arff_dict["attributes"][3 + i][0].upper() != "RUNSTATUS":
+        if attributes[3 + i][0].upper() != "RUNSTATUS":
             self.logger.error(
-                "runstatus as last attribute is missing in %s" % (file_))
+                "runstatus as last attribute is missing in %s" % (fn))
             sys.exit(3)
 
-        algo_inst_col = ['instance_id', 'repetition', 'algorithm']
-        perf_col = []
-        for perf in self.performance_measure:
-            perf_col.append(perf)
-        status_col = ['runstatus']
+        inst_col, algo_col = attributes[0][0], attributes[2][0]
+        perf_cols = [attr[0] for attr in attributes[3:3 + i]]
+        status_col = attributes[3 + i][0]
 
-        perf_data = pd.DataFrame(arff_dict['data'],
-                                 columns=algo_inst_col+perf_col+status_col)
-        perf_data.drop('repetition', axis=1, inplace=True)
+        # the instance x algorithm matrices are filled chunk by chunk;
+        # rows and columns are allocated on first occurrence of an instance or algorithm
+        inst_indx, algo_indx = {}, {}
+        init_shape = (1024, max(1, len(self.algorithms)))
+        perf_bufs = [np.full(init_shape, np.nan, dtype=self.dtype)
+                     for _ in perf_cols]
+        status_buf = np.full(init_shape, RUNSTATUS_CODE["unknown"], dtype=np.int8)
 
-        self.runstatus_data = \
-            perf_data.pivot('instance_id', 'algorithm', 'runstatus')
-        perf_data.drop('runstatus', axis=1, inplace=True)
+        with reader:
+            try:
+                for chunk in reader.iter_data():
+                    rows = self._get_positions(chunk[inst_col].values, inst_indx)
+                    cols = self._get_positions(chunk[algo_col].values, algo_indx)
+                    shape = (len(inst_indx), len(algo_indx))
+                    perf_bufs = [self._grow(buf, shape, np.nan) for buf in perf_bufs]
+                    status_buf = self._grow(
+                        status_buf, shape, RUNSTATUS_CODE["unknown"])
+                    # if runs are repeated, the last run is used
+                    for buf, perf in zip(perf_bufs, perf_cols):
+                        buf[rows, cols] = chunk[perf].values
+                    status_buf[rows, cols] = self.encode_runstatus(
+                        chunk[status_col].values)
+            except ARFFError as e:
+                self.logger.error(
+                    "Parsing of arff file failed (%s) - %s" % (fn, e))
+                sys.exit(3)
 
-        for perf in self.performance_measure:
-            self.performance_data_all.append(
-                perf_data.pivot('instance_id', 'algorithm', perf))
-            perf_data.drop(perf, axis=1, inplace=True)
+        # same order as pandas.pivot: sorted instances and algorithms
+        insts = np.array(sorted(inst_indx), dtype=object)
+        algos = np.array(sorted(algo_indx), dtype=object)
+        ix = np.ix_([inst_indx[inst] for inst in insts],
+                    [algo_indx[algo] for algo in algos])
+        index = pd.Index(insts, name="instance_id")
+        columns = pd.Index(algos, name="algorithm")
+
+        self.runstatus_data = pd.DataFrame(
+            status_buf[ix], index=index, columns=columns)
+        del status_buf
+
+        for perf, buf in zip(self.performance_measure, perf_bufs):
+            self.performance_data_all.append(pd.DataFrame(
+                buf[ix], index=index, columns=columns))
+        del perf_bufs
 
         self.performance_data = self.performance_data_all[0]
 
         self.instances = list(self.performance_data.index)
 
+    @staticmethod
+    def _get_positions(names, positions: dict):
+        '''
+            maps names to their positions;
+            unseen names are appended to <positions>
+
+            Arguments
+            ---------
+            names: numpy.array
+                array of names
+            positions: dict
+                name -> position
+
+            Returns
+            -------
+            numpy.array
+                array of positions
+        '''
+        codes, uniques = pd.factorize(names)
+        for name in uniques:
+            if name not in positions:
+                positions[name] = len(positions)
+        return np.array([positions[name] for name in uniques], dtype=np.int64)[codes]
+
+    @staticmethod
+    def _grow(buf, shape: tuple, fill_value):
+        '''
+            ensures that <buf> has at least <shape>;
+            if not, the buffer is reallocated
+            (with 50% additional rows to amortize further growing)
+
+            Arguments
+            ---------
+            buf: numpy.array
+                2-dim buffer
+            shape: tuple
+                minimal shape
+            fill_value: 
+                value of new entries
+
+            Returns
+            -------
+            numpy.array
+                buffer (the same or a new one)
+        '''
+        if buf.shape[0] >= shape[0] and buf.shape[1] >= shape[1]:
+            return buf
+        new_shape = (max(buf.shape[0], int(1.5 * shape[0])),
+                     max(buf.shape[1], shape[1]))
+        new_buf = np.full(new_shape, fill_value, dtype=buf.dtype)
+        new_buf[:buf.shape[0], :buf.shape[1]] = buf
+        return new_buf
+
+    def encode_runstatus(self, values):
+        '''
+            encodes run stati as int8 codes (see RUNSTATUS);
+            missing values are encoded as "unknown"
+            and unknown run stati as "other"
+
+            Arguments
+            ---------
+            values: numpy.array
+                run stati as strings
+
+            Returns
+            -------
+            numpy.array
+                int8 codes with the same shape as values
+        '''
+        values = np.asarray(values, dtype=object)
+        codes = pd.Categorical(values.ravel(), categories=RUNSTATUS).codes
+        codes = codes.astype(np.int8).reshape(values.shape)
+
+        invalid = (codes == -1)
+        if invalid.any():
+            missing = pd.isnull(values)
+            if (invalid & ~missing).any():
+                self.logger.warn("Unknown runstatus (replaced by \"other\"): %s" % (
+                    set(values[invalid & ~missing])))
+            codes[invalid & ~missing] = RUNSTATUS_CODE["other"]
+            codes[invalid & missing] = RUNSTATUS_CODE["unknown"]
+
+        return codes
+
     def read_feature_values(self, file_):
         '''
             reads feature file
@@ -402,19 +1103,20 @@ class ASlibScenario(object):
 
         self.logger.info("Read %s" % (file_))
 
-        with open(file_, "r") as fp:
-            try:
-                arff_dict = arff.load(fp)
-            except arff.BadNominalValue:
-                self.logger.error(
-                    "Parsing of arff file failed (%s) - maybe conflict of header and data." % (file_))
-                sys.exit(3)
+        try:
+            with ARFFReader(file_) as reader:
+                attributes = reader.attributes
+                data = reader.read_data()
+        except ARFFError as e:
+            self.logger.error(
+                "Parsing of arff file failed (%s) - %s" % (file_, e))
+            sys.exit(3)
 
-        if arff_dict["attributes"][0][0].upper() != "INSTANCE_ID":
+        if attributes[0][0].upper() != "INSTANCE_ID":
             self.logger.error(
                 "instance_id as first attribute is missing in %s" % (file_))
             sys.exit(3)
-        if arff_dict["attributes"][1][0].upper() != "REPETITION":
+        if attributes[1][0].upper() != "REPETITION":
             self.logger.error(
                 "repetition as second attribute is missing in %s" % (file_))
             sys.exit(3)
@@ -422,7 +1124,7 @@ class ASlibScenario(object):
         feature_set = set(self.features_deterministic).union(
             self.features_stochastic)
 
-        for f_name in arff_dict["attributes"][2:]:
+        for f_name in attributes[2:]:
             f_name = f_name[0]
             self.features.append(f_name)
             if not f_name in feature_set:
@@ -430,40 +1132,30 @@ class ASlibScenario(object):
                     "Feature \"%s\" was not defined as deterministic or stochastic" % (f_name))
                 sys.exit(3)
 
-        pairs_inst_rep = []
-        encoutered_features = []
-        inst_feats = {}
-        for data in arff_dict["data"]:
-            inst_name = data[0]
-            repetition = data[1]
-            features = data[2:]
-
-            if len(features) != len(self.features):
-                self.logger.error(
-                    "Number of features in attributes does not match number of found features; instance: %s" % (inst_name))
-                sys.exit(3)
-
-            # TODO: handle feature repetitions
-            inst_feats[inst_name] = features
-
-            # not only Nones in feature vector and previously seen
-            if functools.reduce(lambda x, y: True if (x or y) else False, features, False) and features in encoutered_features:
-                self.logger.warn(
-                    "Feature vector found twice: %s" % (",".join(map(str, features))))
-            else:
-                encoutered_features.append(features)
-
-            if (inst_name, repetition) in pairs_inst_rep:
-                self.logger.warn(
-                    "Pair (%s,%s) is not unique in %s" % (inst_name, repetition, file_))
-            else:
-                pairs_inst_rep.append((inst_name, repetition))
+        cols = [attr[0] for attr in attributes[2:]]
+        inst_col, rep_col = attributes[0][0], attributes[1][0]
+        # single copy of all features into one float matrix
+        values = data[cols].values.astype(self.dtype, copy=False)
+        insts = data[inst_col].values
+        repetitions = data[rep_col].values
+        del data
+
+        # hash-based detection of duplicates (linear in the number of instances);
+        # feature vectors with only missing or zero values are not reported
+        feat_df = pd.DataFrame(values, copy=False)
+        informative = np.any((values != 0) & ~np.isnan(values), axis=1)
+        for row in np.flatnonzero(feat_df.duplicated().values & informative):
+            self.logger.warn("Feature vector found twice: %s" % (
+                ",".join(str(None) if np.isnan(v) else str(v) for v in values[row].tolist())))
+
+        pairs_inst_rep = pd.DataFrame({"inst": insts, "rep": repetitions})
+        for row in np.flatnonzero(pairs_inst_rep.duplicated().values):
+            self.logger.warn(
+                "Pair (%s,%s) is not unique in %s" % (insts[row], repetitions[row], file_))
 
-        # convert to pandas
-        data = np.array(arff_dict["data"])
-        cols = list(map(lambda x: x[0], arff_dict["attributes"][2:]))
+        # TODO: handle feature repetitions
         self.feature_data = pd.DataFrame(
-            data[:, 2:], index=data[:, 0], columns=cols, dtype=np.float)
+            values, index=insts, columns=cols, copy=False)
 
     def read_feature_costs(self, file_):
         '''
@@ -481,37 +1173,35 @@ class ASlibScenario(object):
         '''
         self.logger.info("Read %s" % (file_))
 
-        with open(file_, "r") as fp:
-            try:
-                arff_dict = arff.load(fp)
-            except arff.BadNominalValue:
-                self.logger.error(
-                    "Parsing of arff file failed (%s) - maybe conflict of header and data." % (file_))
-                sys.exit(3)
+        try:
+            with ARFFReader(file_) as reader:
+                attributes = reader.attributes
+                data = reader.read_data()
+        except ARFFError as e:
+            self.logger.error(
+                "Parsing of arff file failed (%s) - %s" % (file_, e))
+            sys.exit(3)
 
-        if arff_dict["attributes"][0][0].upper() != "INSTANCE_ID":
+        if attributes[0][0].upper() != "INSTANCE_ID":
             self.logger.error(
                 "\"instance_id\" as first attribute is missing in %s" % (file_))
             sys.exit(3)
-        if arff_dict["attributes"][1][0].upper() != "REPETITION":
+        if attributes[1][0].upper() != "REPETITION":
             self.logger.error(
                 "\"repetition\" as second attribute is missing in %s" % (file_))
             sys.exit(3)
         found_groups = list(
-            map(str, sorted(map(lambda x: x[0], arff_dict["attributes"][2:]))))
+            map(str, sorted(map(lambda x: x[0], attributes[2:]))))
         for meta_group in self.feature_group_dict.keys():
             if meta_group not in found_groups:
                 self.logger.error(
                     "\"%s\" as attribute is missing in %s" % (meta_group, file_))
                 sys.exit(3)
 
-        inst_cost = {}
-
         # convert to pandas
-        data = np.array(arff_dict["data"])
-        cols = list(map(lambda x: x[0], arff_dict["attributes"][2:]))
+        cols = [attr[0] for attr in attributes[2:]]
         self.feature_cost_data = pd.DataFrame(
-            data[:, 2:], index=data[:, 0], columns=cols, dtype=np.float)
+            data[cols].values.astype(np.float64), index=data[attributes[0][0]].values, columns=cols)
 
         self.feature_cost_data[pd.isnull(self.feature_cost_data)] = 0
 
@@ -529,40 +1219,41 @@ class ASlibScenario(object):
         '''
         self.logger.info("Read %s" % (file_))
 
-        with open(file_, "r") as fp:
-            try:
-                arff_dict = arff.load(fp)
-            except arff.BadNominalValue:
-                self.logger.error(
-                    "Parsing of arff file failed (%s) - maybe conflict of header and data." % (file_))
-                sys.exit(3)
+        try:
+            with ARFFReader(file_) as reader:
+                attributes = reader.attributes
+                data = reader.read_data()
+        except ARFFError as e:
+            self.logger.error(
+                "Parsing of arff file failed (%s) - %s" % (file_, e))
+            sys.exit(3)
 
-        if arff_dict["attributes"][0][0].upper() != "INSTANCE_ID":
+        if attributes[0][0].upper() != "INSTANCE_ID":
             self.logger.error(
                 "instance_id as first attribute is missing in %s" % (file_))
             sys.exit(3)
-        if arff_dict["attributes"][1][0].upper() != "REPETITION":
+        if attributes[1][0].upper() != "REPETITION":
             self.logger.error(
                 "repetition as second attribute is missing in %s" % (file_))
             sys.exit(3)
 
-        for f_name in arff_dict["attributes"][2:]:
+        for f_name in attributes[2:]:
             f_name = f_name[0]
             if not f_name in self.feature_group_dict.keys():
                 self.logger.error(
                     "Feature step \"%s\" was not defined in feature steps" % (f_name))
                 sys.exit(3)
 
-        if len(self.feature_group_dict.keys()) != len(arff_dict["attributes"][2:]):
+        if len(self.feature_group_dict.keys()) != len(attributes[2:]):
             self.logger.error("Number of feature steps in description.txt (%d) and feature_runstatus.arff (%d) does not match." % (
-                len(self.feature_group_dict.keys()), len(arff_dict["attributes"][2:-1])))
+                len(self.feature_group_dict.keys()), len(attributes[2:])))
             sys.exit(3)
 
-        # convert to pandas
-        data = np.array(arff_dict["data"])
-        cols = list(map(lambda x: x[0], arff_dict["attributes"][2:]))
+        # convert to pandas (int8 codes of run stati)
+        cols = [attr[0] for attr in attributes[2:]]
         self.feature_runstatus_data = pd.DataFrame(
-            data[:, 2:], index=data[:, 0], columns=cols)
+            self.encode_runstatus(data[cols].values),
+            index=data[attributes[0][0]].values, columns=cols)
 
     def read_ground_truth(self, file_):
         '''
@@ -578,28 +1269,28 @@ class ASlibScenario(object):
 
         self.logger.info("Read %s" % (file_))
 
-        with open(file_, "r") as fp:
-            try:
-                arff_dict = arff.load(fp)
-            except arff.BadNominalValue:
-                self.logger.error(
-                    "Parsing of arff file failed (%s) - maybe conflict of header and data." % (file_))
-                sys.exit(3)
+        try:
+            with ARFFReader(file_) as reader:
+                attributes = reader.attributes
+                data = reader.read_data()
+        except ARFFError as e:
+            self.logger.error(
+                "Parsing of arff file failed (%s) - %s" % (file_, e))
+            sys.exit(3)
 
-        if arff_dict["attributes"][0][0].upper() != "INSTANCE_ID":
+        if attributes[0][0].upper() != "INSTANCE_ID":
             self.logger.error(
                 "instance_id as first attribute is missing in %s" % (file_))
             sys.exit(3)
 
         # extract feature names
-        for attr in arff_dict["attributes"][1:]:
+        for attr in attributes[1:]:
             self.ground_truths[attr[0]] = attr[1]
 
         # convert to panda
-        data = np.array(arff_dict["data"])
-        cols = list(map(lambda x: x[0], arff_dict["attributes"][1:]))
+        cols = [attr[0] for attr in attributes[1:]]
         self.ground_truth_data = pd.DataFrame(
-            data=data[:, 1:], index=data[:, 0].tolist(), columns=cols)
+            data=data[cols].values, index=data[attributes[0][0]].tolist(), columns=cols)
 
     def read_cv(self, file_):
         '''
@@ -612,32 +1303,32 @@ class ASlibScenario(object):
         '''
         self.logger.info("Read %s" % (file_))
 
-        with open(file_, "r") as fp:
-            try:
-                arff_dict = arff.load(fp)
-            except arff.BadNominalValue:
-                self.logger.error(
-                    "Parsing of arff file failed (%s) - maybe conflict of header and data." % (file_))
-                sys.exit(3)
+        try:
+            with ARFFReader(file_) as reader:
+                attributes = reader.attributes
+                data = reader.read_data()
+        except ARFFError as e:
+            self.logger.error(
+                "Parsing of arff file failed (%s) - %s" % (file_, e))
+            sys.exit(3)
 
-        if arff_dict["attributes"][0][0].upper() != "INSTANCE_ID":
+        if attributes[0][0].upper() != "INSTANCE_ID":
             self.logger.error(
                 "instance_id as first attribute is missing in %s" % (file_))
             sys.exit(3)
-        if arff_dict["attributes"][1][0].upper() != "REPETITION":
+        if attributes[1][0].upper() != "REPETITION":
             self.logger.error(
                 "repetition as second attribute is missing in %s" % (file_))
             sys.exit(3)
-        if arff_dict["attributes"][2][0].upper() != "FOLD":
+        if attributes[2][0].upper() != "FOLD":
             self.logger.error(
                 "fold as third attribute is missing in %s" % (file_))
             sys.exit(3)
 
         # convert to pandas
-        data = np.array(arff_dict["data"])
-        cols = list(map(lambda x: x[0], arff_dict["attributes"][2:]))
+        cols = [attr[0] for attr in attributes[2:]]
         self.cv_data = pd.DataFrame(
-            data[:, 2:], index=data[:, 0], columns=cols, dtype=np.float)
+            data[cols].values.astype(np.float64), index=data[attributes[0][0]].values, columns=cols)
 
     def check_data(self):
         '''
@@ -645,24 +1336,9 @@ class ASlibScenario(object):
             and makes some transformations
         '''
 
-        for perf_type_i, perf_type in enumerate(self.performance_type):
+        self._transform_performance_data(
+            performance_data_all=self.performance_data_all, runstatus_data=self.runstatus_data)
 
-            if perf_type == "runtime" and self.maximize[perf_type_i]:
-                self.logger.error("Maximizing runtime is not supported")
-                sys.exit(3)
-    
-            if perf_type == "runtime":
-                # replace all non-ok scores with par10 values
-                self.logger.debug(
-                    "Replace all runtime data with PAR10 values for non-OK runs")
-                self.performance_data_all[perf_type_i][
-                    self.runstatus_data != "ok"] = self.algorithm_cutoff_time * 10
-    
-            if perf_type == "solution_quality" and self.maximize[perf_type_i]:
-                self.logger.info(
-                    "Multiply all performance data by -1, since autofolio minimizes the scores but the objective is to maximize")
-                self.performance_data_all[perf_type_i] *= -1
-    
         all_data = [self.feature_data, self.feature_cost_data,
                         self.feature_runstatus_data, self.ground_truth_data,
                         self.cv_data]
@@ -683,6 +1359,221 @@ class ASlibScenario(object):
                 self.logger.error("Some instances are listed more than once")
                 sys.exit(3)
 
+    def _transform_performance_data(self, performance_data_all: list, runstatus_data):
+        '''
+            transforms performance data (in place) such that autofolio can minimize it:
+            runtimes of non-ok runs are replaced by PAR10 values
+            and maximized solution qualities are multiplied by -1
+
+            Arguments
+            ---------
+            performance_data_all: list
+                list of pandas.DataFrame; one for each performance measure
+            runstatus_data: pandas.DataFrame
+                int8 coded run stati with the same shape as the performance data
+        '''
+        for perf_type_i, perf_type in enumerate(self.performance_type):
+
+            if perf_type == "runtime" and self.maximize[perf_type_i]:
+                self.logger.error("Maximizing runtime is not supported")
+                sys.exit(3)
+    
+            if perf_type == "runtime":
+                # replace all non-ok scores with par10 values
+                self.logger.debug(
+                    "Replace all runtime data with PAR10 values for non-OK runs")
+                performance_data_all[perf_type_i][
+                    runstatus_data != RUNSTATUS_CODE["ok"]] = self.algorithm_cutoff_time * 10
+    
+            if perf_type == "solution_quality" and self.maximize[perf_type_i]:
+                self.logger.info(
+                    "Multiply all performance data by -1, since autofolio minimizes the scores but the objective is to maximize")
+                performance_data_all[perf_type_i] *= -1
+
+    def _get_delta_runstatus(self, runstatus_data, performance_data):
+        '''
+            returns int8 coded run stati for new performance data;
+            if no run stati are given, all runs are "ok"
+            (or "timeout" if a runtime is not below the cutoff)
+
+            Arguments
+            ---------
+            runstatus_data: pandas.DataFrame
+                run stati (as strings or int8 codes) or None
+            performance_data: pandas.DataFrame
+                new (raw) performance data of the first performance measure
+
+            Returns
+            -------
+            pandas.DataFrame
+        '''
+        if runstatus_data is None:
+            status = np.full(performance_data.shape,
+                             RUNSTATUS_CODE["ok"], dtype=np.int8)
+            if self.performance_type[0] == "runtime":
+                status[performance_data.values >=
+                       self.algorithm_cutoff_time] = RUNSTATUS_CODE["timeout"]
+            return pd.DataFrame(status, index=performance_data.index,
+                                columns=performance_data.columns)
+
+        runstatus_data = runstatus_data.reindex(
+            index=performance_data.index, columns=performance_data.columns)
+        if runstatus_data.values.dtype == object:
+            return pd.DataFrame(self.encode_runstatus(runstatus_data.values),
+                                index=runstatus_data.index, columns=runstatus_data.columns)
+        return runstatus_data.astype(np.int8)
+
+    def add_instances(self, feature_data, performance_data, runstatus_data=None,
+                      feature_cost_data=None, feature_runstatus_data=None, folds=None):
+        '''
+            appends new instances to the loaded scenario (in place);
+            only the new data is validated and transformed (see check_data());
+            the update is recorded in self.updates
+
+            Arguments
+            ---------
+            feature_data: pandas.DataFrame
+                instance features (row: new instance, column: feature)
+            performance_data: pandas.DataFrame or list
+                raw performance data (row: new instance, column: algorithm);
+                a list with one data frame for each performance measure
+            runstatus_data: pandas.DataFrame
+                run stati as strings or int8 codes;
+                if None, all runs are "ok" (or "timeout" if not below the runtime cutoff)
+            feature_cost_data: pandas.DataFrame
+                feature costs (row: new instance, column: feature step);
+                required if the scenario has feature costs
+            feature_runstatus_data: pandas.DataFrame
+                run stati of feature steps; if None, all are "ok"
+            folds: pandas.Series
+                cv fold of each new instance; if None, random folds are assigned
+        '''
+        if not isinstance(performance_data, list):
+            performance_data = [performance_data]
+        if len(performance_data) != len(self.performance_data_all):
+            raise ValueError("Expected performance data for %d performance measures" % (
+                len(self.performance_data_all)))
+
+        new_insts = list(feature_data.index)
+        if len(set(new_insts)) != len(new_insts):
+            raise ValueError("Some new instances are listed more than once")
+        known = set(new_insts).intersection(self.instances)
+        if known:
+            raise ValueError("Instances are already part of the scenario: %s" % (known))
+
+        def align(data, columns, name, dtype=None):
+            missing = set(new_insts).difference(data.index)
+            if missing:
+                raise ValueError("Missing instances in %s: %s" % (name, missing))
+            missing = set(columns).difference(data.columns)
+            if missing:
+                raise ValueError("Missing columns in %s: %s" % (name, missing))
+            data = data.reindex(index=new_insts, columns=columns)
+            return data.astype(dtype, copy=False) if dtype else data
+
+        delta_feature = align(feature_data, self.feature_data.columns,
+                              "feature_data", self.dtype)
+        delta_perf = [align(data, self.performance_data_all[0].columns, "performance_data", self.dtype)
+                      for data in performance_data]
+        delta_status = self._get_delta_runstatus(runstatus_data, delta_perf[0])
+
+        if feature_runstatus_data is None:
+            delta_fstatus = pd.DataFrame(
+                np.full((len(new_insts), self.feature_runstatus_data.shape[1]),
+                        RUNSTATUS_CODE["ok"], dtype=np.int8),
+                index=new_insts, columns=self.feature_runstatus_data.columns)
+        else:
+            delta_fstatus = align(feature_runstatus_data,
+                                  self.feature_runstatus_data.columns, "feature_runstatus_data")
+            if delta_fstatus.values.dtype == object:
+                delta_fstatus = pd.DataFrame(self.encode_runstatus(delta_fstatus.values),
+                                             index=new_insts, columns=delta_fstatus.columns)
+
+        if self.feature_cost_data is not None:
+            if feature_cost_data is None:
+                raise ValueError("Scenario has feature costs but no costs of new instances are given")
+            delta_cost = align(feature_cost_data, self.feature_cost_data.columns,
+                               "feature_cost_data").fillna(0)
+
+        self._transform_performance_data(
+            performance_data_all=delta_perf, runstatus_data=delta_status)
+
+        if self.cv_data is not None:
+            if folds is None:
+                n_folds = int(self.cv_data["fold"].max())
+                folds = np.random.randint(1, n_folds + 1, size=len(new_insts))
+            else:
+                folds = pd.Series(folds, index=new_insts).reindex(new_insts).values
+            self.cv_data = pd.concat([self.cv_data, pd.DataFrame(
+                {"fold": np.asarray(folds, dtype=np.float64)}, index=new_insts)])
+
+        self.feature_data = pd.concat([self.feature_data, delta_feature])
+        self.performance_data_all = [pd.concat([data, delta])
+                                     for data, delta in zip(self.performance_data_all, delta_perf)]
+        self.performance_data = self.performance_data_all[0]
+        self.runstatus_data = pd.concat([self.runstatus_data, delta_status])
+        self.feature_runstatus_data = pd.concat(
+            [self.feature_runstatus_data, delta_fstatus])
+        if self.feature_cost_data is not None:
+            self.feature_cost_data = pd.concat(
+                [self.feature_cost_data, delta_cost])
+
+        self.instances = list(self.instances) + new_insts
+        self.updates.append(("instances", new_insts))
+        self.logger.info("Added %d instances" % (len(new_insts)))
+
+    def add_algorithms(self, performance_data, runstatus_data=None):
+        '''
+            appends new algorithms to the loaded scenario (in place);
+            only the new data is validated and transformed (see check_data());
+            the update is recorded in self.updates
+
+            Arguments
+            ---------
+            performance_data: pandas.DataFrame or list
+                raw performance data (row: instance, column: new algorithm)
+                of all instances in the scenario;
+                a list with one data frame for each performance measure
+            runstatus_data: pandas.DataFrame
+                run stati as strings or int8 codes;
+                if None, all runs are "ok" (or "timeout" if not below the runtime cutoff)
+        '''
+        if not isinstance(performance_data, list):
+            performance_data = [performance_data]
+        if len(performance_data) != len(self.performance_data_all):
+            raise ValueError("Expected performance data for %d performance measures" % (
+                len(self.performance_data_all)))
+
+        new_algos = list(performance_data[0].columns)
+        if len(set(new_algos)) != len(new_algos):
+            raise ValueError("Some new algorithms are listed more than once")
+        known = set(new_algos).intersection(self.algorithms)
+        if known:
+            raise ValueError("Algorithms are already part of the scenario: %s" % (known))
+
+        index = self.performance_data_all[0].index
+        delta_perf = []
+        for data in performance_data:
+            missing = set(index).difference(data.index)
+            if missing:
+                raise ValueError("Missing instances in performance_data: %s" % (missing))
+            delta_perf.append(data.reindex(index=index, columns=new_algos).astype(
+                self.dtype, copy=False))
+        delta_status = self._get_delta_runstatus(runstatus_data, delta_perf[0])
+
+        self._transform_performance_data(
+            performance_data_all=delta_perf, runstatus_data=delta_status)
+
+        self.performance_data_all = [pd.concat([data, delta], axis=1)
+                                     for data, delta in zip(self.performance_data_all, delta_perf)]
+        self.performance_data = self.performance_data_all[0]
+        self.runstatus_data = pd.concat(
+            [self.runstatus_data, delta_status], axis=1)
+
+        self.algorithms = list(self.algorithms) + new_algos
+        self.updates.append(("algorithms", new_algos))
+        self.logger.info("Added %d algorithms" % (len(new_algos)))
+
     def get_split(self, indx=1):
         '''
             returns a copy of self but only with the data of the i-th cross validation split according to cv.arff
@@ -703,47 +1594,33 @@ class ASlibScenario(object):
                 "The ASlib scenario has not provided any cv.arff; create CV split...")
             self.create_cv_splits()
 
-        test_insts = self.cv_data[
-            self.cv_data["fold"] == float(indx)].index.tolist()
-        training_insts = self.cv_data[
-            self.cv_data.fold != float(indx)].index.tolist()
+        fold_index = self.get_fold_index()
+
+        cv_order, cv_folds = fold_index["cv_data"][1:]
+        test_insts = self.cv_data.index[cv_order[cv_folds == indx]].tolist()
+        training_insts = self.cv_data.index[cv_order[cv_folds != indx]].tolist()
 
         test = copy.copy(self)
         training = copy.copy(self)
+        for split in (test, training):
+            split.updates = list(self.updates)
+            if self._shared is not None:
+                # own handle: the splits keep the store alive but never remove it
+                split._shared = dict(self._shared, owner=False,
+                                     frames=dict(self._shared["frames"]))
+
+        # integer position indexing (sorted by instance names)
+        for name in SPLIT_FRAMES:
+            if name not in fold_index:
+                continue
+            data, order, folds = fold_index[name]
+            setattr(test, name, data.iloc[order[folds == indx]])
+            setattr(training, name, data.iloc[order[folds != indx]])
 
-        # feature_data
-        test.feature_data = test.feature_data.drop(training_insts).sort_index()
-        training.feature_data = training.feature_data.drop(
-            test_insts).sort_index()
-        # performance_data
-        test.performance_data = test.performance_data.drop(
-            training_insts).sort_index()
-        training.performance_data = training.performance_data.drop(
-            test_insts).sort_index()
-        # runstatus_data
-        test.runstatus_data = test.runstatus_data.drop(
-            training_insts).sort_index()
-        training.runstatus_data = training.runstatus_data.drop(
-            test_insts).sort_index()
-        # self.feature_runstatus_data
-        test.feature_runstatus_data = test.feature_runstatus_data.drop(
-            training_insts).sort_index()
-        training.feature_runstatus_data = training.feature_runstatus_data.drop(
-            test_insts).sort_index()
-        # feature_cost_data
-        if self.feature_cost_data is not None:
-            test.feature_cost_data = test.feature_cost_data.drop(
-                training_insts).sort_index()
-            training.feature_cost_data = training.feature_cost_data.drop(
-                test_insts).sort_index()
-        # ground_truth_data
-        if self.ground_truth_data is not None:
-            test.ground_truth_data = test.ground_truth_data.drop(
-                training_insts).sort_index()
-            training.ground_truth_data = training.ground_truth_data.drop(
-                test_insts).sort_index()
         test.cv_data = None
         training.cv_data = None
+        test._fold_index = None
+        training._fold_index = None
 
         test.instances = test_insts
         training.instances = training_insts
@@ -752,6 +1629,93 @@ class ASlibScenario(object):
 
         return test, training
 
+    def get_fold_index(self):
+        '''
+            computes (once) for each data frame the positions of its rows
+            sorted by instance names and the fold of each of these rows;
+            the cache is refreshed if a data frame or cv_data is replaced
+
+            Returns
+            -------
+            dict
+                name of data frame -> (data frame, positions, folds)
+        '''
+        frames = [(name, getattr(self, name)) for name in SPLIT_FRAMES + ["cv_data"]]
+        if self._fold_index is None or \
+                any(self._fold_index.get(name, (None,))[0] is not data
+                    for name, data in frames):
+            folds = self.cv_data["fold"]
+            self._fold_index = {}
+            for name, data in frames:
+                if data is None:
+                    continue
+                order = np.argsort(data.index.values, kind="mergesort")
+                self._fold_index[name] = (
+                    data, order, folds.reindex(data.index[order]).values)
+        return self._fold_index
+
+    def compile_feature_groups(self):
+        '''
+            precomputes (once after loading) the dependency graph of the feature steps
+            and the positions of the features of each step in feature_data;
+            see get_active_feature_groups()
+        '''
+        self.feature_group_requires = dict(
+            (group, frozenset(d.get("requires") or []))
+            for group, d in self.feature_group_dict.items())
+
+        self.feature_group_columns = self.feature_data.columns
+        positions = self.feature_group_columns.get_indexer
+        self.feature_group_indices = {}
+        for group, d in self.feature_group_dict.items():
+            indices = positions(d.get("provides") or [])
+            if (indices < 0).any():
+                self.logger.warn("Feature step %s provides unknown features" % (group))
+            self.feature_group_indices[group] = indices
+
+        self._feature_group_closure = {}
+
+    def get_active_feature_groups(self, groups):
+        '''
+            returns the feature steps which can be computed given the selected feature steps,
+            i.e., all selected steps whose requirements are recursively selected,
+            and the positions of their features in feature_data;
+            cached per set of selected steps
+
+            Arguments
+            ---------
+            groups: iterable
+                selected feature steps
+
+            Returns
+            -------
+            list
+                sorted active feature steps
+            numpy.ndarray
+                positions of the provided features (in order of the active steps)
+        '''
+        groups = frozenset(groups)
+        closure = self._feature_group_closure.get(groups)
+        if closure is not None:
+            return closure
+
+        active = set(groups)
+        change = True
+        while change:
+            change = False
+            for group in list(active):
+                if not self.feature_group_requires[group] <= active:
+                    active.remove(group)
+                    change = True
+
+        active = sorted(active)
+        indices = np.concatenate(
+            [self.feature_group_indices[group] for group in active] +
+            [np.zeros(0, dtype=np.intp)])
+        closure = (active, indices)
+        self._feature_group_closure[groups] = closure
+        return closure
+
     def create_cv_splits(self, n_folds: int=10):
         '''
             creates cv splits and saves them in self.cv_data
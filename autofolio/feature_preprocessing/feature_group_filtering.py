@@ -28,6 +28,10 @@ class FeatureGroupFiltering(object):
         self.logger = logging.getLogger("FeatureGroupFiltering")
         self.active_features = []
         self.active_groups = []
+        # feature names of the fitted data and positions of the active features therein
+        self.columns = None
+        self.active_indices = None
+        self._fitted_columns = None
 
     def fit(self, scenario, config):
         '''
@@ -44,7 +48,10 @@ class FeatureGroupFiltering(object):
         for param in config:
             if param.startswith("fgroup_") and config[param]:
                 active_groups.append(param.replace("fgroup_", ""))
-        
+
+        if self._fit_compiled(scenario, active_groups):
+            return
+
         active_groups.sort() # to ensure same order of features always
         
         # check requirements for each step
@@ -71,11 +78,54 @@ class FeatureGroupFiltering(object):
                 self.active_features.extend(scenario.feature_group_dict[group].get("provides"))
         
         self.logger.debug("Active features (%d): %s" %(len(self.active_features), self.active_features))
+
+        self.columns = list(scenario.feature_data.columns)
+        self.active_indices = self._get_indices(scenario.feature_data.columns)
             
         if not self.active_features:
             self.logger.warn("No active features left after filtering according to selected feature steps")
 
 
+    def _fit_compiled(self, scenario, groups: list):
+        '''
+            fit based on the feature steps precompiled by the scenario
+            (see ASlibScenario.compile_feature_groups());
+            not possible for scenarios without them (e.g., saved by older versions),
+            with other feature columns or with unknown provided features
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+            groups: list
+                selected feature steps
+
+            Returns
+            -------
+            bool
+                True if fitted
+        '''
+        columns = getattr(scenario, "feature_group_columns", None)
+        if columns is None or not (columns is scenario.feature_data.columns or
+                                   columns.equals(scenario.feature_data.columns)):
+            return False
+
+        active_groups, indices = scenario.get_active_feature_groups(groups)
+        if (indices < 0).any():
+            return False
+
+        self.logger.debug("Active feature groups: %s" %(active_groups))
+        self.active_groups = active_groups
+        self.active_indices = indices
+        self.active_features = list(columns[indices])
+        self.columns = list(columns)
+        # same columns object as in later splits of the scenario
+        self._fitted_columns = columns
+
+        if not self.active_features:
+            self.logger.warn("No active features left after filtering according to selected feature steps")
+        return True
+
     def transform(self, scenario):
         '''
             transform ASLib scenario data
@@ -96,6 +146,61 @@ class FeatureGroupFiltering(object):
         
         return scenario
 
+    def transform_array(self, values: np.ndarray, columns):
+        '''
+            selects the active features of a feature matrix
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+            columns: list
+                feature names of the columns of values
+
+            Returns
+            -------
+            numpy.ndarray
+                new Fortran-ordered matrix (instances x active features),
+                i.e., the same memory layout as the values of a data frame
+        '''
+        if columns is getattr(self, "_fitted_columns", None) or list(columns) == self.columns:
+            indices = self.active_indices
+        else:
+            indices = self._get_indices(columns)
+        return np.take(values.T, indices, axis=0).T
+
+    def get_feature_mask(self, scenario, groups):
+        '''
+            returns which of the active features are provided by the given feature steps
+            (e.g., the steps computed so far)
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with the feature steps
+            groups: list
+                feature steps
+
+            Returns
+            -------
+            numpy.ndarray
+                boolean vector over self.active_features
+        '''
+        provided = set()
+        for group in groups:
+            provided.update(scenario.feature_group_dict[group].get("provides") or [])
+        return np.array([f in provided for f in self.active_features], dtype=bool)
+
+    def _get_indices(self, columns):
+        '''
+            returns the positions of the active features in columns
+        '''
+        indices = pd.Index(columns).get_indexer(self.active_features)
+        if (indices < 0).any():
+            raise KeyError("Features not found: %s" % (
+                [f for f, i in zip(self.active_features, indices) if i < 0]))
+        return indices
+
     def fit_transform(self, scenario, config):
         '''
             fit and transform
@@ -0,0 +1,292 @@
+import logging
+import itertools
+
+import numpy as np
+
+from ConfigSpace.configuration_space import ConfigurationSpace
+from ConfigSpace.forbidden import ForbiddenEqualsClause, ForbiddenAndConjunction
+
+from autofolio.data.aslib_scenario import ASlibScenario, RUNSTATUS_CODE
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class FeatureStepSelection(object):
+    '''
+        estimates for each combination of feature steps of a runtime scenario
+        its feature computation cost and the PAR10 of a cheap selector using its features
+        (k nearest neighbors with leave-one-out, evaluated as in Validator.validate_runtime());
+        proposes the combination with the best estimated end-to-end PAR10 as default
+        and forbids combinations which are dominated by a cheaper one;
+        should be fitted on training instances only (see AutoFolio.run_cv())
+    '''
+
+    def __init__(self, max_steps: int=10, max_instances: int=1000, k: int=10,
+                 margin: float=0.05, max_forbiddens: int=100, random_seed: int=12345):
+        '''
+            Constructor
+
+            Arguments
+            ---------
+            max_steps: int
+                all combinations are only evaluated for at most max_steps feature steps;
+                otherwise steps are greedily added and only the empty selection is pruned
+            max_instances: int
+                number of (randomly sampled) instances used for the estimates
+            k: int
+                number of neighbors of the selector
+            margin: float
+                a combination is pruned if a combination with at most its cost
+                has an estimated PAR10 lower by at least this fraction
+            max_forbiddens: int
+                maximal number of forbidden dominated combinations
+                (the ones with the worst estimated PAR10 are kept)
+            random_seed: int
+                seed of the instance sample
+        '''
+        self.max_steps = max_steps
+        self.max_instances = max_instances
+        self.k = k
+        self.margin = margin
+        self.max_forbiddens = max_forbiddens
+        self.random_seed = random_seed
+
+        # frozenset of steps -> (mean feature cost, estimated PAR10)
+        self.estimates = {}
+        self.default_steps = None
+        # dominated combinations of steps (frozensets) with all their requirements
+        self.dominated = []
+        # (step, required step) pairs of the requirement graph
+        self.requirements = []
+
+        self.logger = logging.getLogger("FeatureStepSelection")
+
+    def fit(self, scenario: ASlibScenario):
+        '''
+            estimates cost and PAR10 of the combinations of feature steps
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+
+            Returns
+            -------
+            bool
+                False if the scenario is no runtime scenario with feature costs
+        '''
+        if scenario.performance_type[0] != "runtime" or scenario.feature_cost_data is None:
+            self.logger.info(
+                "Feature step selection requires a runtime scenario with feature costs")
+            return False
+
+        rng = np.random.RandomState(self.random_seed)
+        instances = scenario.feature_data.index
+        if len(instances) > self.max_instances:
+            instances = instances[np.sort(rng.choice(
+                len(instances), self.max_instances, replace=False))]
+
+        self._cutoff = scenario.algorithm_cutoff_time
+        self._features = scenario.feature_data.loc[instances].values.astype(np.float64)
+        self._perf = scenario.performance_data.loc[instances].values.astype(np.float64)
+        self._ok = scenario.runstatus_data.loc[instances].values == RUNSTATUS_CODE["ok"]
+        self._costs = scenario.feature_cost_data.loc[instances]
+        self._presolved = scenario.feature_runstatus_data.loc[instances] == RUNSTATUS_CODE["presolved"]
+        self._scenario = scenario
+        self.requirements = sorted((step, req) for step, reqs in scenario.feature_group_requires.items()
+                                   for req in reqs)
+
+        steps = list(scenario.feature_steps)
+        if len(steps) <= self.max_steps:
+            selections = [frozenset(combination) for r in range(len(steps) + 1)
+                          for combination in itertools.combinations(steps, r)]
+            for selection in selections:
+                self._estimate(selection)
+            self._prune(selections)
+        else:
+            self._greedy(steps)
+            # no features at all cannot be fitted
+            self.dominated = [frozenset()]
+
+        # without any feature step, there are no features to fit the selector on
+        candidates = [c for c in self.estimates if c] or list(self.estimates)
+        default = min(candidates, key=lambda c: (self.estimates[c][1], self.estimates[c][0]))
+        self.default_steps = sorted(default)
+        self.logger.info("Proposed default feature steps: %s (cost: %.2f, PAR10: %.2f)" % (
+            self.default_steps, self.estimates[default][0], self.estimates[default][1]))
+
+        del self._features, self._perf, self._ok, self._costs, self._presolved, self._scenario
+        return True
+
+    def _estimate(self, combination):
+        '''
+            estimates mean feature cost and PAR10 of the feature steps which are
+            active given the selected combination (see ASlibScenario.get_active_feature_groups())
+
+            Arguments
+            ---------
+            combination: iterable
+                selected feature steps
+
+            Returns
+            -------
+            tuple
+                (mean feature cost, estimated PAR10)
+        '''
+        active, indices = self._scenario.get_active_feature_groups(combination)
+        key = frozenset(active)
+        if key in self.estimates:
+            return self.estimates[key]
+
+        cost = self._costs[active].values.sum(axis=1)
+        presolved = self._presolved[active].values.any(axis=1)
+
+        selected = self._select(indices)
+        n = len(selected)
+        runtime = self._perf[np.arange(n), selected]
+        used_time = cost + runtime
+        solved = self._ok[np.arange(n), selected] & (used_time <= self._cutoff)
+        par10 = np.where(solved, used_time, 10 * self._cutoff)
+        # instances presolved during feature computation
+        par10 = np.where(presolved, np.where(cost < self._cutoff, cost, 10 * self._cutoff), par10)
+
+        self.estimates[key] = (cost.mean(), par10.mean())
+        return self.estimates[key]
+
+    def _select(self, indices: np.ndarray):
+        '''
+            selects for each instance the algorithm with the lowest mean PAR10
+            on its k nearest neighbors (excluding itself) wrt the given features
+
+            Arguments
+            ---------
+            indices: numpy.ndarray
+                positions of the features in feature_data
+
+            Returns
+            -------
+            numpy.ndarray
+                position of the selected algorithm per instance
+        '''
+        n = self._perf.shape[0]
+        if len(indices) == 0:
+            # single best algorithm
+            return np.full(n, self._perf.mean(axis=0).argmin())
+
+        X = self._features[:, indices]
+        means = np.nanmean(np.where(np.isfinite(X), X, np.nan), axis=0)
+        means[np.isnan(means)] = 0
+        X = np.where(np.isfinite(X), X, means)
+        std = X.std(axis=0)
+        std[std == 0] = 1
+        X = (X - X.mean(axis=0)) / std
+
+        sq_norms = (X ** 2).sum(axis=1)
+        distances = sq_norms[:, None] + sq_norms[None, :] - 2 * X.dot(X.T)
+        np.fill_diagonal(distances, np.inf)
+        k = min(self.k, n - 1)
+        neighbors = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        return self._perf[neighbors].mean(axis=1).argmin(axis=1)
+
+    def _prune(self, selections: list):
+        '''
+            collects all combinations with all their requirements which are dominated,
+            i.e., a combination with at most the same cost
+            has an estimated PAR10 lower by at least the margin
+            (selections with missing requirements are forbidden by add_forbiddens());
+            the empty combination (no features) is always forbidden
+            and is no reference, so the best combination with features is never dominated;
+            at most max_forbiddens combinations are kept (the empty one and the worst ones)
+
+            Arguments
+            ---------
+            selections: list
+                all combinations of selected steps (frozensets)
+        '''
+        dominated = {frozenset()}
+        best_par10 = np.inf
+        for combination, (cost, par10) in sorted(self.estimates.items(), key=lambda e: e[1]):
+            if not combination:
+                continue
+            if par10 > best_par10 * (1 + self.margin):
+                dominated.add(combination)
+            best_par10 = min(best_par10, par10)
+
+        closed = [selection for selection in selections
+                  if frozenset(self._scenario.get_active_feature_groups(selection)[0]) == selection]
+        self.dominated = sorted((selection for selection in closed if selection in dominated),
+                                key=lambda c: (bool(c), -self.estimates[c][1]))
+        self.logger.info("%d of %d combinations of feature steps are dominated" % (
+            len(self.dominated), len(closed)))
+        if len(self.dominated) > self.max_forbiddens:
+            self.logger.info("Only the %d dominated combinations with the worst PAR10 are forbidden" % (
+                self.max_forbiddens))
+            self.dominated = self.dominated[:self.max_forbiddens]
+
+    def _greedy(self, steps: list):
+        '''
+            adds steps (and their requirements) to the combination
+            as long as the estimated PAR10 improves
+
+            Arguments
+            ---------
+            steps: list
+                all feature steps
+        '''
+        current = frozenset()
+        best = self._estimate(current)[1]
+        while True:
+            candidates = []
+            for step in steps:
+                if step in current:
+                    continue
+                combination = current | {step} | self._get_requirements(step)
+                candidates.append((self._estimate(combination)[1], combination))
+            if not candidates:
+                break
+            par10, combination = min(candidates, key=lambda c: c[0])
+            if par10 >= best:
+                break
+            best = par10
+            current = frozenset(self._scenario.get_active_feature_groups(combination)[0])
+
+    def _get_requirements(self, step: str):
+        '''
+            returns all (transitively) required steps of a step
+        '''
+        requirements = set()
+        todo = [step]
+        while todo:
+            for req in self._scenario.feature_group_requires.get(todo.pop(), []):
+                if req not in requirements:
+                    requirements.add(req)
+                    todo.append(req)
+        return requirements
+
+    def add_forbiddens(self, cs: ConfigurationSpace, steps: list):
+        '''
+            forbids selections of feature steps with missing requirements
+            (one clause per edge of the requirement graph)
+            and the dominated combinations (one clause each)
+
+            Arguments
+            ---------
+            cs: ConfigurationSpace
+                configuration space with "fgroup_<step>" parameters
+            steps: list
+                all feature steps
+        '''
+        if not steps:
+            return
+        for step, req in self.requirements:
+            if step not in steps or req not in steps:
+                continue
+            cs.add_forbidden_clause(ForbiddenAndConjunction(
+                ForbiddenEqualsClause(cs.get_hyperparameter("fgroup_%s" % (step)), True),
+                ForbiddenEqualsClause(cs.get_hyperparameter("fgroup_%s" % (req)), False)))
+        for selection in self.dominated:
+            clauses = [ForbiddenEqualsClause(cs.get_hyperparameter("fgroup_%s" % (step)),
+                                             step in selection)
+                       for step in steps]
+            cs.add_forbidden_clause(ForbiddenAndConjunction(*clauses))
@@ -1,4 +1,5 @@
 import logging
+from collections import Counter
 
 import numpy as np
 import pandas as pd
@@ -27,11 +28,25 @@ class ImputerWrapper(object):
             "imputer_strategy", choices=["mean", "median", "most_frequent"], default="mean")
         cs.add_hyperparameter(stratgey)
 
-    def __init__(self):
+    def __init__(self, max_distinct_values: int=10000):
         '''
             Constructor
+
+            Arguments
+            ---------
+            max_distinct_values: int
+                maximal number of distinct values counted per feature
+                by partial_fit_array() (strategies "median" and "most_frequent")
         '''
         self.imputer = None
+        self.max_distinct_values = max_distinct_values
+
+        # sufficient statistics of partial_fit_array() calls:
+        # number and sum of non-missing values per feature (strategy "mean")
+        # or counts of the distinct values per feature (else)
+        self._n_values = None
+        self._sum_values = None
+        self._value_counts = None
 
         self.logger = logging.getLogger("MissingValueImputation")
 
@@ -47,8 +62,157 @@ class ImputerWrapper(object):
                 configuration
         '''
 
-        self.imputer = Imputer(strategy=config.get("imputer_strategy"))
-        self.imputer.fit(scenario.feature_data.values)
+        self.fit_array(scenario.feature_data.values, config)
+
+    def fit_array(self, values: np.ndarray, config: Configuration):
+        '''
+            fit imputer object to feature matrix
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        # copy=False: transform_array() imputes in place
+        self.imputer = Imputer(
+            strategy=config.get("imputer_strategy"), copy=False)
+        self.imputer.fit(values)
+        self._n_values = None
+        self._sum_values = None
+        self._value_counts = None
+
+    def partial_fit(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            update imputer object with a chunk of ASlib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with (new) data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+
+        self.partial_fit_array(scenario.feature_data.values, config)
+
+    def partial_fit_array(self, values: np.ndarray, config: Configuration):
+        '''
+            update imputer object with a chunk of a feature matrix;
+            only sums (strategy "mean") or value counts per feature
+            (strategies "median" and "most_frequent") are kept in memory.
+            The statistics are the same as of fit_array() on all chunks
+            as long as a feature has at most max_distinct_values distinct values;
+            beyond, the value counts are compressed (see _compress_counts())
+            such that memory stays bounded and the statistics become approximations.
+            fit_array() starts from scratch
+            since sklearn's Imputer does not keep these statistics.
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        strategy = config.get("imputer_strategy")
+        if self.imputer is None or self.imputer.strategy != strategy or \
+                (self._n_values is None and self._value_counts is None):
+            self.imputer = Imputer(strategy=strategy, copy=False)
+            self._n_values = None
+            self._sum_values = None
+            self._value_counts = None
+            if strategy == "mean":
+                self._n_values = np.zeros(values.shape[1], dtype=np.int64)
+                self._sum_values = np.zeros(values.shape[1], dtype=np.float64)
+            else:
+                self._value_counts = [Counter() for _ in range(values.shape[1])]
+
+        missing = np.isnan(values)
+        if strategy == "mean":
+            self._n_values += values.shape[0] - missing.sum(axis=0)
+            self._sum_values += np.where(missing, 0, values).sum(axis=0, dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                statistics = self._sum_values / self._n_values
+            # features without any value have no statistic (as in sklearn)
+            statistics[self._n_values == 0] = np.nan
+        else:
+            statistics = np.empty(values.shape[1], dtype=np.float64)
+            for f, counter in enumerate(self._value_counts):
+                counter.update(dict(zip(*np.unique(
+                    values[~missing[:, f], f], return_counts=True))))
+                if len(counter) > self.max_distinct_values:
+                    counter = self._compress_counts(counter, strategy, self.max_distinct_values)
+                    self._value_counts[f] = counter
+                statistics[f] = self._get_statistic(counter, strategy)
+
+        # transform_array() only needs the statistics of the sklearn object
+        self.imputer.statistics_ = statistics
+
+    @staticmethod
+    def _compress_counts(counter: Counter, strategy: str, max_values: int):
+        '''
+            reduces value counts to at most max_values distinct values:
+            for "most_frequent", only the max_values most frequent values are kept;
+            for "median", consecutive values are merged into max_values bins
+            of about the same count (represented by their weighted mean),
+            so the median is off by at most the width of one bin
+
+            Arguments
+            ---------
+            counter: collections.Counter
+                counts of distinct values
+            strategy: str
+                "median" or "most_frequent"
+            max_values: int
+                maximal number of distinct values
+
+            Returns
+            -------
+            collections.Counter
+        '''
+        if strategy == "most_frequent":
+            return Counter(dict(counter.most_common(max_values)))
+        keys = np.array(sorted(counter))
+        counts = np.array([counter[k] for k in keys], dtype=np.int64)
+        cum_counts = np.cumsum(counts)
+        # bin of each value by the number of values below it
+        bins = (cum_counts - counts) * max_values // cum_counts[-1]
+        bin_counts = np.bincount(bins, weights=counts, minlength=max_values)
+        bin_sums = np.bincount(bins, weights=keys * counts, minlength=max_values)
+        non_empty = bin_counts > 0
+        return Counter(dict(zip(bin_sums[non_empty] / bin_counts[non_empty],
+                                bin_counts[non_empty].astype(np.int64))))
+
+    @staticmethod
+    def _get_statistic(counter: Counter, strategy: str):
+        '''
+            returns the median or most frequent value given value counts
+            (ties broken as in sklearn: mean of the two middle values; smallest value)
+
+            Arguments
+            ---------
+            counter: collections.Counter
+                counts of distinct values
+            strategy: str
+                "median" or "most_frequent"
+
+            Returns
+            -------
+            float
+        '''
+        if not counter:
+            return np.nan
+        keys = np.array(sorted(counter))
+        counts = np.array([counter[k] for k in keys])
+        if strategy == "most_frequent":
+            return keys[np.argmax(counts)]
+        cum_counts = np.cumsum(counts)
+        n = cum_counts[-1]
+        lower = keys[np.searchsorted(cum_counts, (n - 1) // 2, side="right")]
+        upper = keys[np.searchsorted(cum_counts, n // 2, side="right")]
+        return (lower + upper) / 2
 
     def transform(self, scenario: ASlibScenario):
         '''
@@ -65,13 +229,37 @@ class ImputerWrapper(object):
         '''
         self.logger.debug("Impute Missing Feature Values")
 
-        values = self.imputer.transform(
-            np.array(scenario.feature_data.values))
+        values = self.transform_array(np.array(scenario.feature_data.values))
         scenario.feature_data = pd.DataFrame(
             data=values, index=scenario.feature_data.index, columns=scenario.feature_data.columns)
 
         return scenario
 
+    def transform_array(self, values: np.ndarray):
+        '''
+            impute missing values of a feature matrix in place
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features); overwritten
+
+            Returns
+            -------
+            numpy.ndarray
+                imputed feature matrix with the same dtype as values
+        '''
+        dtype = values.dtype
+        statistics = self.imputer.statistics_
+        missing = np.isnan(values)
+        if np.isnan(statistics).any() or np.isinf(values).any():
+            # sklearn drops features without statistics and rejects infinite values
+            values = self.imputer.transform(values)
+        elif missing.any():
+            # same assignment as in sklearn without its input validation
+            values[missing] = np.broadcast_to(statistics, values.shape)[missing]
+        return values.astype(dtype, copy=False)
+
     def fit_transform(self, scenario: ASlibScenario, config: Configuration):
         '''
             fit and transform
@@ -3,7 +3,7 @@ import logging
 import numpy as np
 import pandas as pd
 
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 
 from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
     UniformFloatHyperparameter, UniformIntegerHyperparameter
@@ -19,6 +19,15 @@ __license__ = "BSD"
 
 class PCAWrapper(object):
 
+    # solver "auto": feature matrices larger than this (in bytes)
+    # are fitted in mini-batches with IncrementalPCA
+    INCREMENTAL_MIN_BYTES = 2**30
+    # solver "auto": the randomized SVD is used if the matrix has more
+    # than this number of rows or columns (as in sklearn's PCA)
+    RANDOMIZED_MIN_DIM = 500
+    # minimal number of instances per mini-batch of IncrementalPCA
+    MIN_BATCH_SIZE = 1000
+
     @staticmethod
     def add_params(cs: ConfigurationSpace):
         '''
@@ -28,11 +37,17 @@ class PCAWrapper(object):
             "pca", choices=[True, False], default=False)
         n_components = UniformIntegerHyperparameter(
             "pca_n_components", lower=1, upper=20, default=7, log=True)
+        solver = CategoricalHyperparameter(
+            "pca_solver", choices=["auto", "exact", "randomized", "incremental"], default="auto")
         cs.add_hyperparameter(pca_switch)
         cs.add_hyperparameter(n_components)
+        cs.add_hyperparameter(solver)
         cond = InCondition(
             child=n_components, parent=pca_switch, values=[True])
         cs.add_condition(cond)
+        cond = InCondition(
+            child=solver, parent=pca_switch, values=[True])
+        cs.add_condition(cond)
 
     def __init__(self):
         '''
@@ -54,9 +69,103 @@ class PCAWrapper(object):
                 configuration
         '''
 
+        self.fit_array(scenario.feature_data.values, config)
+
+    def fit_array(self, values: np.ndarray, config: Configuration):
+        '''
+            fit pca object to feature matrix
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        if config.get("pca"):
+            n_components = config.get("pca_n_components")
+            solver = config.get("pca_solver", "auto")
+            if solver == "auto":
+                solver = self._get_solver(values.shape, values.itemsize, n_components)
+            self.logger.debug("PCA solver: %s" % (solver))
+
+            if solver == "incremental":
+                self.pca = IncrementalPCA(n_components=n_components)
+                # IncrementalPCA.fit() copies the full matrix; batches are copied one by one
+                batch_size = max(5 * values.shape[1], self.MIN_BATCH_SIZE)
+                n_batches = max(1, values.shape[0] // batch_size)
+                for batch in np.array_split(values, n_batches):
+                    self.pca.partial_fit(batch)
+            elif solver == "randomized":
+                self.pca = PCA(n_components=n_components, svd_solver="randomized")
+                self.pca.fit(values)
+            else:
+                self.pca = PCA(n_components=n_components, svd_solver="full")
+                self.pca.fit(values)
+
+    def _get_solver(self, shape: tuple, itemsize: int, n_components: int):
+        '''
+            picks the PCA solver from the shape of the feature matrix:
+            mini-batches of IncrementalPCA if the matrix is larger than
+            INCREMENTAL_MIN_BYTES (the other solvers need several copies of it),
+            the randomized SVD for large matrices and few components,
+            else the exact (full) SVD
+
+            Arguments
+            ---------
+            shape: tuple
+                (instances, features)
+            itemsize: int
+                bytes per feature value
+            n_components: int
+                number of principal components
+
+            Returns
+            -------
+            str
+                "incremental", "randomized" or "exact"
+        '''
+        n_instances, n_features = shape
+        if n_instances * n_features * itemsize > self.INCREMENTAL_MIN_BYTES:
+            return "incremental"
+        if max(shape) > self.RANDOMIZED_MIN_DIM and \
+                n_components < 0.8 * min(shape):
+            return "randomized"
+        return "exact"
+
+    def partial_fit(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            update pca object with a chunk of ASlib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with (new) data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+
+        self.partial_fit_array(scenario.feature_data.values, config)
+
+    def partial_fit_array(self, values: np.ndarray, config: Configuration):
+        '''
+            update pca object with a chunk of a feature matrix;
+            the exact PCA cannot be updated,
+            so IncrementalPCA is used independent of "pca_solver".
+            Each chunk needs at least "pca_n_components" instances.
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+            config: ConfigSpace.Configuration
+                configuration
+        '''
         if config.get("pca"):
-            self.pca = PCA(n_components=config.get("pca_n_components"))
-            self.pca.fit(scenario.feature_data.values)
+            if not isinstance(self.pca, IncrementalPCA):
+                self.pca = IncrementalPCA(
+                    n_components=config.get("pca_n_components"))
+            self.pca.partial_fit(values)
 
     def transform(self, scenario: ASlibScenario):
         '''
@@ -73,14 +182,38 @@ class PCAWrapper(object):
         '''
         if self.pca:
             self.logger.debug("Applying PCA")
-            values = self.pca.transform(
-                np.array(scenario.feature_data.values))
+            values = self.transform_array(np.array(scenario.feature_data.values))
 
             scenario.feature_data = pd.DataFrame(
-                data=values, index=scenario.feature_data.index, columns=["f%d" % (i) for i in range(self.pca.n_components_)])
+                data=values, index=scenario.feature_data.index, columns=self.get_columns())
 
         return scenario
 
+    def transform_array(self, values: np.ndarray):
+        '''
+            project a feature matrix on the principal components
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+
+            Returns
+            -------
+            numpy.ndarray
+                new matrix (instances x components) with the same dtype as values
+        '''
+        if self.pca:
+            dtype = values.dtype
+            values = self.pca.transform(values).astype(dtype, copy=False)
+        return values
+
+    def get_columns(self):
+        '''
+            returns the names of the principal components
+        '''
+        return ["f%d" % (i) for i in range(self.pca.n_components_)]
+
     def fit_transform(self, scenario: ASlibScenario, config: Configuration):
         '''
             fit and transform
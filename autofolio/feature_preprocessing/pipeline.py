@@ -0,0 +1,164 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from ConfigSpace import Configuration
+
+from autofolio.data.aslib_scenario import ASlibScenario
+from autofolio.feature_preprocessing.feature_group_filtering import FeatureGroupFiltering
+from autofolio.feature_preprocessing.missing_values import ImputerWrapper
+from autofolio.feature_preprocessing.standardscaler import StandardScalerWrapper
+from autofolio.feature_preprocessing.pca import PCAWrapper
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class FeaturePreprocessingPipeline(object):
+    '''
+        fused feature preprocessing:
+        feature group filtering, imputation, scaling and PCA
+        are applied to a single numpy buffer (in place where possible);
+        the data frame of the scenario is replaced only once at the end
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+        self.fgf = FeatureGroupFiltering()
+        self.imputer = ImputerWrapper()
+        self.scaler = StandardScalerWrapper()
+        self.pca = PCAWrapper()
+        # order of application
+        self.stages = [self.fgf, self.imputer, self.scaler, self.pca]
+        # feature names after preprocessing
+        self.columns = None
+
+        self.logger = logging.getLogger("FeaturePreprocessing")
+
+    def fit(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            fit all preprocessing steps to ASlib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        self.fit_transform(scenario, config)
+
+    def transform(self, scenario: ASlibScenario):
+        '''
+            transform ASLib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+
+            Returns
+            -------
+            data.aslib_scenario.ASlibScenario
+        '''
+        values = self.fgf.transform_array(
+            scenario.feature_data.values, scenario.feature_data.columns)
+        values = self.imputer.transform_array(values)
+        values = self.scaler.transform_array(values)
+        values = self.pca.transform_array(values)
+
+        return self._set_feature_data(scenario, values)
+
+    def fit_transform(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            fit and transform
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+
+            Returns
+            -------
+            data.aslib_scenario.ASlibScenario
+        '''
+        self.fgf.fit(scenario, config)
+        # new buffer; all following steps can work in place
+        values = self.fgf.transform_array(
+            scenario.feature_data.values, scenario.feature_data.columns)
+
+        self.imputer.fit_array(values, config)
+        values = self.imputer.transform_array(values)
+
+        self.scaler.fit_array(values, config)
+        values = self.scaler.transform_array(values)
+
+        self.pca.fit_array(values, config)
+        values = self.pca.transform_array(values)
+
+        if self.pca.pca:
+            self.columns = pd.Index(self.pca.get_columns())
+        else:
+            self.columns = pd.Index(self.fgf.active_features)
+
+        return self._set_feature_data(scenario, values)
+
+    def partial_fit(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            update all preprocessing steps with a chunk of ASlib scenario data
+            (e.g., newly solved instances) without keeping former chunks;
+            the feature groups are selected on the first call.
+            Each step is updated with the chunk transformed by the previous steps
+            as fitted so far, so the result approximates fit() on all chunks.
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with (new) data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        if self.fgf.columns is None:
+            self.fgf.fit(scenario, config)
+        # new buffer; all following steps can work in place
+        values = self.fgf.transform_array(
+            scenario.feature_data.values, scenario.feature_data.columns)
+
+        self.imputer.partial_fit_array(values, config)
+        values = self.imputer.transform_array(values)
+
+        self.scaler.partial_fit_array(values, config)
+        values = self.scaler.transform_array(values)
+
+        self.pca.partial_fit_array(values, config)
+
+        if self.pca.pca:
+            self.columns = pd.Index(self.pca.get_columns())
+        else:
+            self.columns = pd.Index(self.fgf.active_features)
+
+    def _set_feature_data(self, scenario: ASlibScenario, values: np.ndarray):
+        '''
+            replaces the feature data of the scenario by the preprocessed features
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+            values: numpy.ndarray
+                preprocessed feature matrix
+
+            Returns
+            -------
+            data.aslib_scenario.ASlibScenario
+        '''
+        scenario.feature_data = pd.DataFrame(
+            data=values, index=scenario.feature_data.index, columns=self.columns, copy=False)
+        scenario.used_feature_groups = self.fgf.active_groups
+
+        return scenario
@@ -48,9 +48,56 @@ class StandardScalerWrapper(object):
                 configuration
         '''
 
+        self.fit_array(scenario.feature_data.values, config)
+
+    def fit_array(self, values: np.ndarray, config: Configuration):
+        '''
+            fit StandardScaler object to feature matrix
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        if config.get("StandardScaler"):
+            # copy=False: transform_array() scales in place
+            self.scaler = StandardScaler(copy=False)
+            self.scaler.fit(values)
+
+    def partial_fit(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            update StandardScaler object with a chunk of ASlib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with (new) data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+
+        self.partial_fit_array(scenario.feature_data.values, config)
+
+    def partial_fit_array(self, values: np.ndarray, config: Configuration):
+        '''
+            update StandardScaler object with a chunk of a feature matrix;
+            running mean and variance are updated
+            (continuing a previous fit_array() or partial_fit_array())
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features)
+            config: ConfigSpace.Configuration
+                configuration
+        '''
         if config.get("StandardScaler"):
-            self.scaler = StandardScaler()
-            self.scaler.fit(scenario.feature_data.values)
+            if self.scaler is None:
+                # copy=False: transform_array() scales in place
+                self.scaler = StandardScaler(copy=False)
+            self.scaler.partial_fit(values)
 
     def transform(self, scenario: ASlibScenario):
         '''
@@ -67,15 +114,35 @@ class StandardScalerWrapper(object):
         '''
         if self.scaler:
             self.logger.debug("Applying StandardScaler")
-            
-            values = self.scaler.transform(
-                np.array(scenario.feature_data.values))
+
+            values = self.transform_array(np.array(scenario.feature_data.values))
 
             scenario.feature_data = pd.DataFrame(
                 data=values, index=scenario.feature_data.index, columns=scenario.feature_data.columns)
 
         return scenario
 
+    def transform_array(self, values: np.ndarray):
+        '''
+            scale a feature matrix in place
+
+            Arguments
+            ---------
+            values: numpy.ndarray
+                feature matrix (instances x features); overwritten
+
+            Returns
+            -------
+            numpy.ndarray
+                scaled feature matrix with the same dtype as values
+        '''
+        if self.scaler:
+            # same arithmetic as StandardScaler.transform(copy=False)
+            # without its input validation (see ImputerWrapper.transform_array())
+            values -= self.scaler.mean_
+            values /= self.scaler.scale_
+        return values
+
     def fit_transform(self, scenario: ASlibScenario, config: Configuration):
         '''
             fit and transform
@@ -0,0 +1,270 @@
+import io
+import re
+import itertools
+
+import numpy as np
+import pandas as pd
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+ATTRIBUTE_PATTERN = re.compile(
+    r"^@attribute\s+('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\S+)\s+(.+)$", re.IGNORECASE)
+# one value of a data line (single-quoted, double-quoted or unquoted) and its separator
+VALUE_PATTERN = re.compile(
+    r"\s*('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|[^,'\"]*?)\s*(,|$)")
+# substrings of chunks which have to be read line by line (double quotes
+# or lines starting with a comment, a line break or whitespace), see ARFFReader._read_chunk()
+LINE_BY_LINE_MARKERS = ["\"", "\n%", "\n\n", "\n ", "\n\t"]
+# appended as an extra value to each data line; pandas parses it into the extra column
+# iff the line has one value per attribute (see ARFFReader.iter_data())
+SENTINEL = "\x01"
+
+
+class ARFFError(ValueError):
+    '''
+        raised if an ARFF file cannot be parsed
+    '''
+    pass
+
+
+class ARFFReader(object):
+    '''
+        streaming reader for the subset of ARFF used by ASlib,
+        i.e., a header with @RELATION and @ATTRIBUTE lines
+        and a dense, comma-separated @DATA section;
+        the data section is parsed in chunks by the C parser of pandas
+        such that numeric columns end up directly in numpy buffers
+    '''
+
+    def __init__(self, fn: str, chunksize: int=2**16):
+        '''
+            Constructor
+
+            Arguments
+            ---------
+            fn: str
+                file name of ARFF file
+            chunksize: int
+                number of data lines parsed at once
+        '''
+        self.fn = fn
+        self.chunksize = chunksize
+
+        self.relation = None
+        # list of (name, type) with type "NUMERIC", "STRING" or a list of nominal values
+        # (same format as liac-arff)
+        self.attributes = []
+
+        # number of lines read so far (for error messages)
+        self._line_no = 0
+        self._fp = open(fn, "r")
+        self._read_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        '''
+            closes the underlying file
+        '''
+        self._fp.close()
+
+    def _read_header(self):
+        '''
+            reads all lines up to @DATA;
+            afterwards, the file pointer is at the first data line
+        '''
+        for line in iter(self._fp.readline, ""):
+            self._line_no += 1
+            line = line.strip()
+            if not line or line.startswith("%"):
+                continue
+            upper = line.upper()
+            if upper.startswith("@RELATION"):
+                self.relation = line[len("@RELATION"):].strip()
+            elif upper.startswith("@ATTRIBUTE"):
+                match = ATTRIBUTE_PATTERN.match(line)
+                if not match:
+                    raise ARFFError("Bad @ATTRIBUTE line in %s: %s" % (self.fn, line))
+                name, type_ = match.group(1), match.group(2).strip()
+                if name[0] in "'\"":
+                    name = name[1:-1]
+                if type_.startswith("{"):
+                    type_ = [v.strip().strip("'\"")
+                             for v in type_.strip("{} ").split(",")]
+                elif type_.upper() in ["NUMERIC", "REAL", "INTEGER"]:
+                    type_ = "NUMERIC"
+                else:
+                    type_ = "STRING"
+                self.attributes.append((name, type_))
+            elif upper.startswith("@DATA"):
+                return
+            else:
+                raise ARFFError("Unexpected line in header of %s: %s" % (self.fn, line))
+
+        raise ARFFError("@DATA section is missing in %s" % (self.fn))
+
+    def iter_data(self):
+        '''
+            iterates over the data section in chunks;
+            all checks are vectorized on the complete chunk
+            such that most of the time is spent in the C parser of pandas
+            (which releases the GIL, see ASlibScenario.read_files())
+
+            Returns
+            -------
+            generator of pandas.DataFrame
+                chunks of data with the attribute names as columns;
+                numeric attributes are float64,
+                string and nominal attributes are objects
+                (without whitespace at the end);
+                missing values ("?") are NaN;
+                raises ARFFError if a line has not one value per attribute
+        '''
+        names = [name for name, _ in self.attributes] + [SENTINEL]
+        dtype = dict((name, np.float64 if type_ == "NUMERIC" else object)
+                     for name, type_ in self.attributes)
+        dtype[SENTINEL] = object
+        strings = [name for name, type_ in self.attributes if type_ != "NUMERIC"]
+        nominals = [(name, type_) for name, type_ in self.attributes
+                    if isinstance(type_, list)]
+
+        while True:
+            text, line_nos = self._read_chunk()
+            if not text:
+                return
+            # one more value per line
+            text = text.replace("\n", "," + SENTINEL + "\n")
+            try:
+                chunk = pd.read_csv(io.StringIO(text), header=None, names=names,
+                                    dtype=dtype, index_col=False, quotechar="'",
+                                    escapechar="\\", skipinitialspace=True,
+                                    na_values=["?"], keep_default_na=False)
+            except ValueError as e:
+                # e.g., too many values or a shifted sentinel in a numeric column
+                self._check_lines(text, line_nos)
+                raise ARFFError("Parsing of data section of %s failed: %s" % (self.fn, e))
+            bad = (chunk[SENTINEL] != SENTINEL).values
+            if bad.any():
+                self._check_lines(text, line_nos)
+                raise ARFFError("Line %d of %s has not one value per attribute" % (
+                    line_nos[np.argmax(bad)], self.fn))
+            del chunk[SENTINEL]
+
+            # pandas keeps whitespace in front of separators
+            if " ," in text or "\t," in text:
+                for name in strings:
+                    chunk[name] = chunk[name].str.rstrip(" \t")
+            for name, values in nominals:
+                bad = ~chunk[name].isin(values) & chunk[name].notnull()
+                if bad.any():
+                    raise ARFFError("Bad nominal value \"%s\" of attribute %s in %s" % (
+                        chunk[name][bad].iloc[0], name, self.fn))
+            yield chunk
+
+    def _read_chunk(self):
+        '''
+            reads the next (at most chunksize) lines of the data section;
+            chunks with double quotes, comments or empty lines are rewritten line by line
+            (comments and empty lines are skipped,
+            double-quoted values are converted to single-quoted ones),
+            all other chunks are passed on as they are
+
+            Returns
+            -------
+            str
+                data lines (each with a line break)
+            numpy.array
+                line number of each data line in the file
+        '''
+        lines = list(itertools.islice(self._fp, self.chunksize))
+        first_line_no = self._line_no + 1
+        self._line_no += len(lines)
+        text = "".join(lines).replace("\r\n", "\n")
+        if text and not text.endswith("\n"):
+            text += "\n"
+        # substring tests are much faster than a regular expression on the chunk
+        if not any(marker in text for marker in LINE_BY_LINE_MARKERS) and \
+                text[:1] not in ("%", "\n", " ", "\t"):
+            return text, np.arange(first_line_no, first_line_no + text.count("\n"))
+
+        data_lines = []
+        line_nos = []
+        for line_no, line in enumerate(text.split("\n")[:-1], first_line_no):
+            if not line.strip() or line.lstrip().startswith("%"):
+                continue
+            if "\"" in line:
+                line = ",".join(self._normalize(line))
+            data_lines.append(line + "\n")
+            line_nos.append(line_no)
+        return "".join(data_lines), np.array(line_nos, dtype=np.int64)
+
+    def _check_lines(self, text: str, line_nos: np.ndarray):
+        '''
+            finds the first line of a chunk (see iter_data())
+            with not one value per attribute;
+            only called if parsing of the chunk failed
+
+            Arguments
+            ---------
+            text: str
+                data lines with sentinel values
+            line_nos: numpy.array
+                line number of each data line in the file
+        '''
+        for line_no, line in zip(line_nos, text.split("\n")):
+            n_values = len(self._normalize(line)) - 1
+            if n_values != len(self.attributes):
+                raise ARFFError("Line %d of %s has %d values but %d attributes are declared" % (
+                    line_no, self.fn, n_values, len(self.attributes)))
+
+    def _normalize(self, line: str):
+        '''
+            splits a data line into its values as liac-arff does:
+            whitespace around unquoted values is removed
+            and double-quoted values are converted to single-quoted ones
+            (the quote character of the pandas parser)
+
+            Arguments
+            ---------
+            line: str
+                data line without line break
+
+            Returns
+            -------
+            list
+                values of the line
+        '''
+        values = []
+        pos = 0
+        while True:
+            match = VALUE_PATTERN.match(line, pos)
+            if not match:
+                raise ARFFError("Bad data line in %s: %s" % (self.fn, line))
+            value = match.group(1)
+            if value.startswith("\""):
+                # \" -> ", ' -> \'
+                value = "'%s'" % (re.sub(r"\\(.)|'", lambda m: "\\'" if m.group(0) == "'" else
+                                         ("\"" if m.group(1) == "\"" else m.group(0)), value[1:-1]))
+            values.append(value)
+            if not match.group(2):
+                return values
+            pos = match.end()
+
+    def read_data(self):
+        '''
+            reads the complete data section
+
+            Returns
+            -------
+            pandas.DataFrame
+                see iter_data()
+        '''
+        chunks = list(self.iter_data())
+        if not chunks:
+            return pd.DataFrame(columns=[name for name, _ in self.attributes])
+        return pd.concat(chunks, ignore_index=True, copy=False)
@@ -23,6 +23,8 @@ class CMDParser(object):
             "Reading from ASlib Format")
         aslib.add_argument("-s", "--scenario", default=None,
                            help="directory with ASlib scenario files (required if not using --load or csv input files")
+        aslib.add_argument("--scenario_cache", default=None,
+                           help="directory of a binary cache of parsed ASlib scenarios; re-used as long as the scenario files are unchanged")
 
         csv = self._arg_parser.add_argument_group("Reading from CSV Format")
         csv.add_argument("--performance_csv", default=None,
@@ -33,13 +35,31 @@ class CMDParser(object):
                          "runtime", "solution_quality"], help="Are the objective values in the performance data runtimes or an arbitrary solution quality (or cost) value")
         csv.add_argument("--runtime_cutoff", default=None, type=float,
                          help="cutoff time for each algorithm run for the performance data")
+        csv.add_argument("--fold_column", default=None,
+                         help="column in the feature csv with a precomputed cross validation fold (integer) of each instance; folds are renumbered to 1..k and all k folds are evaluated (default: 10 random folds)")
         csv.add_argument("--maximize", default=False, action="store_true", help="Set this parameter to indicate maximization of the performance metric (default: minimization)")
 
         opt = self._arg_parser.add_argument_group("Optional Options")
         opt.add_argument("-t", "--tune", action="store_true", default=False,
                          help="uses SMAC3 to determine a better parameter configuration")
+        opt.add_argument("--stage_cache_mb", type=int, default=1024,
+                         help="memory bound (in MB) of the cache of fitted feature preprocessing per cross validation fold used by --tune; 0 disables the cache")
+        opt.add_argument("--feature_step_selection", action="store_true", default=False,
+                         help="estimates cost-efficient default feature steps from the feature costs (runtime scenarios) and forbids dominated combinations of feature steps in the configuration space")
+        opt.add_argument("--progressive", action="store_true", default=False,
+                         help="cross validation computes the feature steps per instance in cost order and stops as soon as the selection cannot change anymore; reports the saved feature cost")
+        opt.add_argument("--n_jobs", type=int, default=1,
+                         help="number of threads to fit the pairwise classifiers; the fitted models do not depend on it")
+        opt.add_argument("--tree_n_jobs", type=int, default=None,
+                         help="number of threads to build the trees of each random forest (-1: all cores); capped at max(1, #cores // --n_jobs) to not oversubscribe the CPU; default: 1 if --n_jobs > 1, else all cores; the fitted models do not depend on it")
+        opt.add_argument("--forest_cache_mb", type=int, default=1024,
+                         help="memory bound (in MB) of the cache of fitted random forests used by --tune; configurations differing only in rf:n_estimators reuse (warm start) the cached trees; 0 disables the cache")
+        opt.add_argument("--tournament", action="store_true", default=False,
+                         help="pairwise voting evaluates the classifiers adaptively and stops as soon as the selected algorithm cannot change; same selections, fewer classifier evaluations per instance")
         opt.add_argument(
             "-v", "--verbose", choices=["INFO", "DEBUG"], default="INFO", help="verbose level")
+        opt.add_argument("--precision", choices=["float64", "float32"], default="float64",
+                         help="floating point precision of feature and performance data; float32 halves the memory footprint")
         opt.add_argument("--save", type=str, default=None,
                          help="trains AutoFolio and saves AutoFolio's state in the given filename")
         opt.add_argument("--load", type=str, default=None,
@@ -1,3 +1,7 @@
+import re
+import copy
+import hashlib
+
 import numpy as np
 import pandas as pd
 
@@ -8,23 +12,31 @@ from ConfigSpace.configuration_space import ConfigurationSpace
 from ConfigSpace import Configuration
 
 from autofolio.data.aslib_scenario import ASlibScenario
+from autofolio.utils.lru_cache import LRUCache
 
+import sklearn
 from sklearn.ensemble import RandomForestClassifier
 
 __author__ = "Marius Lindauer"
 __license__ = "BSD"
 
+# since sklearn 1.4, tree_.value of classifiers holds class fractions;
+# before, predict_proba() normalized the weighted class counts
+_NORMALIZED_TREE_VALUES = tuple(
+    int(re.match(r"\d*", v).group() or 0) for v in sklearn.__version__.split(".")[:2]) >= (1, 4)
+
 
 class RandomForest(object):
 
     @staticmethod
     def add_params(cs: ConfigurationSpace):
         '''
-            adds parameters to ConfigurationSpace 
+            adds parameters to ConfigurationSpace;
+            an existing "classifier" hyperparameter has to include "RandomForest" as choice
+            (choices cannot be added afterwards, see AutoFolio.get_cs())
         '''
         try:
             classifier = cs.get_hyperparameter("classifier")
-            classifier.choices.append("RandomForest")
         except KeyError:
             classifier = CategoricalHyperparameter(
                 "classifier", choices=["RandomForest"], default="RandomForest")
@@ -74,19 +86,39 @@ class RandomForest(object):
             child=bootstrap, parent=classifier, values=["RandomForest"])
         cs.add_condition(cond)
 
-    def __init__(self):
+    def __init__(self, n_jobs: int=1, forest_cache: LRUCache=None):
         '''
             Constructor
+
+            Arguments
+            ---------
+            n_jobs: int
+                number of threads to build the trees (n_jobs of RandomForestClassifier);
+                predictions are sequential;
+                keep it at 1 if several forests are fitted in parallel
+                (see AutoFolio._get_tree_n_jobs())
+            forest_cache: LRUCache
+                cache of fitted forests; a forest fitted on the same data
+                with the same hyperparameters except rf:n_estimators is reused (see fit())
         '''
 
         self.model = None
+        self.n_jobs = n_jobs
+        self.forest_cache = forest_cache
+        # flat node arrays of all trees (see compile())
+        self.compiled = None
 
     def __str__(self):
         return "RandomForest"
 
     def fit(self, X, y, config: Configuration, weights=None):
         '''
-            fit pca object to ASlib scenario data
+            fit random forest;
+            with a forest cache, a cached forest with the same data and hyperparameters
+            except rf:n_estimators is reused: its first trees if it has enough trees,
+            else it is warm started with the missing trees.
+            In both cases, the forest is the same as if fitted from scratch
+            (the trees are seeded in their order by the fixed random_state).
 
             Arguments
             ---------
@@ -101,18 +133,77 @@ class RandomForest(object):
 
         '''
 
-        self.model = RandomForestClassifier(n_estimators=config["rf:n_estimators"],
-                                            max_features=config[
-                                                "rf:max_features"],
-                                            criterion=config["rf:criterion"],
-                                            max_depth=config["rf:max_depth"],
-                                            min_samples_split=config[
-                                                "rf:min_samples_split"],
-                                            min_samples_leaf=config[
-                                                "rf:min_samples_leaf"],
-                                            bootstrap=config["rf:bootstrap"],
-                                            random_state=12345)
-        self.model.fit(X, y, weights)
+        params = {"max_features": config["rf:max_features"],
+                  "criterion": config["rf:criterion"],
+                  "max_depth": config["rf:max_depth"],
+                  "min_samples_split": config["rf:min_samples_split"],
+                  "min_samples_leaf": config["rf:min_samples_leaf"],
+                  "bootstrap": config["rf:bootstrap"]}
+        n_estimators = config["rf:n_estimators"]
+
+        forest_cache = getattr(self, "forest_cache", None)
+        cached = None
+        if forest_cache is not None:
+            cache_key = self._get_cache_key(X, y, weights, params)
+            cached = forest_cache.get(cache_key)
+
+        # cached forests are never modified (they may be in use by other selectors)
+        if cached is not None and len(cached.estimators_) >= n_estimators:
+            self.model = copy.copy(cached)
+            self.model.estimators_ = cached.estimators_[:n_estimators]
+            self.model.set_params(n_estimators=n_estimators)
+        else:
+            if cached is not None:
+                self.model = copy.copy(cached)
+                self.model.estimators_ = list(cached.estimators_)
+                self.model.set_params(n_estimators=n_estimators, n_jobs=self.n_jobs,
+                                      warm_start=True)
+            else:
+                self.model = RandomForestClassifier(n_estimators=n_estimators,
+                                                    n_jobs=self.n_jobs,
+                                                    random_state=12345,
+                                                    **params)
+            self.model.fit(X, y, weights)
+            # threads only for building the trees: the order of summing up
+            # the predictions of the trees would depend on them
+            self.model.set_params(warm_start=False, n_jobs=1)
+            if forest_cache is not None:
+                nbytes = sum(estimator.tree_.value.nbytes + 64 * estimator.tree_.node_count
+                             for estimator in self.model.estimators_)
+                forest_cache.put(cache_key, self.model, nbytes)
+        self.compiled = None
+
+    @staticmethod
+    def _get_cache_key(X, y, weights, params: dict):
+        '''
+            returns the key of a forest in the forest cache:
+            digest of the training data and all hyperparameters except rf:n_estimators
+
+            Arguments
+            ---------
+            X: numpy.array
+                feature matrix
+            y: numpy.array
+                label vector
+            weights: numpy.array
+                vector with sample weights
+            params: dict
+                hyperparameters of RandomForestClassifier
+
+            Returns
+            -------
+            tuple
+                hashable key
+        '''
+        digest = hashlib.sha1()
+        for array in [X, y, weights]:
+            if array is None:
+                digest.update(b"None")
+                continue
+            array = np.ascontiguousarray(array)
+            digest.update(("%s%s" % (array.dtype, array.shape)).encode())
+            digest.update(array.data)
+        return (digest.hexdigest(), tuple(sorted(params.items())))
 
     def predict(self, X):
         '''
@@ -129,3 +220,257 @@ class RandomForest(object):
         '''
 
         return self.model.predict(X)
+
+    def predict_fast(self, X):
+        '''
+            same as predict() but without the input validation and
+            the thread dispatch of sklearn's forest (as its predict_proba())
+
+            Arguments
+            ---------
+            X: numpy.array
+                instance feature matrix (float32)
+
+            Returns
+            -------
+            numpy.array
+                label vector
+        '''
+        proba = self.model.estimators_[0].predict_proba(X, check_input=False)
+        for estimator in self.model.estimators_[1:]:
+            proba += estimator.predict_proba(X, check_input=False)
+        proba /= len(self.model.estimators_)
+        return self.model.classes_.take(np.argmax(proba, axis=1), axis=0)
+
+    def compile(self):
+        '''
+            exports the fitted trees into flat node arrays
+            (concatenated over all trees; leaves point to themselves)
+            which are evaluated by predict_batch()
+        '''
+        trees = [estimator.tree_ for estimator in self.model.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        feature, threshold, left, right, value = [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            value.append(self._get_node_proba(tree, len(self.model.classes_)))
+
+        self.compiled = {"feature": np.concatenate(feature),
+                         "threshold": np.concatenate(threshold),
+                         "left": np.concatenate(left),
+                         "right": np.concatenate(right),
+                         "value": np.concatenate(value),
+                         "roots": offsets[:-1],
+                         "depth": max(tree.max_depth for tree in trees)}
+
+    @staticmethod
+    def _get_node_proba(tree, n_classes: int):
+        '''
+            class probabilities of all nodes of a fitted tree
+            (as DecisionTreeClassifier.predict_proba() for the leaves)
+
+            Arguments
+            ---------
+            tree: sklearn.tree._tree.Tree
+                fitted tree
+            n_classes: int
+                number of classes
+
+            Returns
+            -------
+            numpy.array
+                nodes x classes matrix
+        '''
+        proba = tree.value[:, 0, :n_classes]
+        if not _NORMALIZED_TREE_VALUES:
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            proba = proba / normalizer
+        return proba
+
+    @staticmethod
+    def compile_batch(forests: list):
+        '''
+            concatenates the node arrays of several compiled forests (see compile())
+            such that predict_batch() evaluates all their trees in one pass
+
+            Arguments
+            ---------
+            forests: list
+                fitted RandomForest objects (compiled if necessary)
+
+            Returns
+            -------
+            dict
+                node arrays of all trees, roots and groups of forests
+                with the same number of trees and classes
+        '''
+        for forest in forests:
+            if forest.compiled is None:
+                forest.compile()
+
+        n_classes = max(len(forest.model.classes_) for forest in forests)
+        node_offsets = np.cumsum([0] + [len(forest.compiled["feature"]) for forest in forests])
+        tree_offsets = np.cumsum([0] + [len(forest.compiled["roots"]) for forest in forests])
+        value = np.zeros((node_offsets[-1], n_classes))
+        for forest, offset in zip(forests, node_offsets):
+            v = forest.compiled["value"]
+            value[offset:offset + v.shape[0], :v.shape[1]] = v
+
+        groups = {}
+        for f, forest in enumerate(forests):
+            key = (len(forest.compiled["roots"]), len(forest.model.classes_))
+            groups.setdefault(key, []).append(f)
+        batch_groups = []
+        for (n_trees, n_cls), indices in groups.items():
+            indices = np.array(indices)
+            batch_groups.append({
+                "forests": indices,
+                # columns of the trees of each forest (forests x trees)
+                "trees": tree_offsets[indices][:, None] + np.arange(n_trees),
+                "classes": np.array([forests[f].model.classes_ for f in indices]),
+                "n_classes": n_cls})
+
+        return {"feature": np.concatenate([forest.compiled["feature"] for forest in forests]),
+                "threshold": np.concatenate([forest.compiled["threshold"] for forest in forests]),
+                "left": np.concatenate([forest.compiled["left"] + offset
+                                        for forest, offset in zip(forests, node_offsets)]),
+                "right": np.concatenate([forest.compiled["right"] + offset
+                                         for forest, offset in zip(forests, node_offsets)]),
+                "value": value,
+                "roots": np.concatenate([forest.compiled["roots"] + offset
+                                         for forest, offset in zip(forests, node_offsets)]),
+                "depth": max(forest.compiled["depth"] for forest in forests),
+                "groups": batch_groups,
+                "n_forests": len(forests),
+                "dtype": np.result_type(*[forest.model.classes_ for forest in forests])}
+
+    @staticmethod
+    def predict_batch(batch: dict, X):
+        '''
+            predicts the labels of all forests of a batch (see compile_batch());
+            all trees are traversed level by level in one vectorized pass
+            and the class probabilities are summed in the order of the trees,
+            so the labels are identical to RandomForestClassifier.predict()
+
+            Arguments
+            ---------
+            batch: dict
+                compiled forests
+            X: numpy.array
+                instance feature matrix
+
+            Returns
+            -------
+            numpy.array
+                instances x forests label matrix
+        '''
+        # trees compare float32 features (see sklearn's DTYPE)
+        X = np.asarray(X, dtype=np.float32)
+        n = X.shape[0]
+        nodes = np.repeat(batch["roots"][None, :], n, axis=0).ravel()
+        # only paths which have not reached a leaf are advanced
+        active = np.arange(nodes.shape[0])
+        active_rows = active // len(batch["roots"])
+        for _ in range(batch["depth"]):
+            current = nodes[active]
+            child = np.where(X[active_rows, batch["feature"][current]] <= batch["threshold"][current],
+                             batch["left"][current], batch["right"][current])
+            nodes[active] = child
+            moved = child != current
+            active, active_rows = active[moved], active_rows[moved]
+            if not len(active):
+                break
+        nodes = nodes.reshape(n, len(batch["roots"]))
+
+        Y = np.empty((n, batch["n_forests"]), dtype=batch["dtype"])
+        for group in batch["groups"]:
+            # instances x forests x trees x classes
+            proba = batch["value"][nodes[:, group["trees"]], :group["n_classes"]]
+            sum_proba = np.zeros(proba.shape[:2] + proba.shape[3:])
+            for t in range(proba.shape[2]):
+                sum_proba += proba[:, :, t]
+            sum_proba /= proba.shape[2]
+            indx = np.argmax(sum_proba, axis=2)
+            Y[:, group["forests"]] = group["classes"][np.arange(len(group["forests"])), indx]
+        return Y
+
+    def predict_bounds(self, X, known):
+        '''
+            predicts labels for which only some features are known:
+            a tree reaches all leaves below a split on an unknown feature,
+            so the label is decided if it is the same for all reachable leaves
+            (as RandomForestClassifier.predict(): argmax of the mean class probabilities)
+
+            Arguments
+            ---------
+            X: numpy.array
+                instance feature matrix; values of unknown features are ignored
+            known: numpy.array
+                boolean vector: which features are known
+
+            Returns
+            -------
+            numpy.array
+                boolean vector: label of the instance is decided
+            numpy.array
+                label vector (only meaningful for decided instances)
+        '''
+        n = X.shape[0]
+        classes = self.model.classes_
+        if len(classes) == 1:
+            return np.ones(n, dtype=bool), np.repeat(classes, n)
+
+        # trees compare float32 features (see sklearn's DTYPE)
+        X = np.asarray(X, dtype=np.float32)
+        # bounds of the sum of p(classes[1]) - p(classes[0]) over all trees
+        lower = np.zeros(n)
+        upper = np.zeros(n)
+        # sums of the class probabilities for instances reaching a single leaf in all trees
+        sum_proba = np.zeros((n, 2))
+        exact = np.ones(n, dtype=bool)
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            proba = self._get_node_proba(tree, len(classes))
+            diff = proba[:, 1] - proba[:, 0]
+
+            tree_lower = np.full(n, np.inf)
+            tree_upper = np.full(n, -np.inf)
+            n_leaves = np.zeros(n, dtype=np.int64)
+            leaf = np.zeros(n, dtype=np.int64)
+            rows = np.arange(n)
+            nodes = np.zeros(n, dtype=np.int64)
+            while len(rows):
+                left = tree.children_left[nodes]
+                is_leaf = left == -1
+                leaf_rows, leaf_nodes = rows[is_leaf], nodes[is_leaf]
+                np.minimum.at(tree_lower, leaf_rows, diff[leaf_nodes])
+                np.maximum.at(tree_upper, leaf_rows, diff[leaf_nodes])
+                np.add.at(n_leaves, leaf_rows, 1)
+                leaf[leaf_rows] = leaf_nodes
+
+                rows, nodes, left = rows[~is_leaf], nodes[~is_leaf], left[~is_leaf]
+                right = tree.children_right[nodes]
+                features = tree.feature[nodes]
+                is_known = known[features]
+                child = np.where(X[rows, features] <= tree.threshold[nodes], left, right)
+                rows = np.concatenate([rows[is_known], rows[~is_known], rows[~is_known]])
+                nodes = np.concatenate([child[is_known], left[~is_known], right[~is_known]])
+
+            lower += tree_lower
+            upper += tree_upper
+            exact &= n_leaves == 1
+            sum_proba += proba[leaf]
+
+        n_estimators = len(self.model.estimators_)
+        exact_label = sum_proba[:, 1] / n_estimators > sum_proba[:, 0] / n_estimators
+        # tolerance for the rounding of the bounds
+        eps = 1e-9
+        decided = exact | (lower > eps) | (upper < -eps)
+        label = np.where(exact, exact_label, lower > eps)
+        return decided, classes[label.astype(int)]
@@ -0,0 +1,117 @@
+import logging
+
+import numpy as np
+
+from ConfigSpace.hyperparameters import CategoricalHyperparameter
+from ConfigSpace.configuration_space import ConfigurationSpace
+from ConfigSpace import Configuration
+
+from autofolio.data.aslib_scenario import ASlibScenario
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class CostSensitiveClassifier(object):
+    '''
+        selects algorithms with a single multi-class classifier:
+        each instance is labelled with its best algorithm and weighted
+        by the mean regret of selecting another algorithm instead;
+        in contrast to PairwiseClassifier, prediction needs one classifier call
+        independent of the number of algorithms
+    '''
+
+    @staticmethod
+    def add_params(cs: ConfigurationSpace):
+        '''
+            adds parameters to ConfigurationSpace;
+            an existing "selector" hyperparameter has to include "CostSensitiveClassifier" as choice
+            (choices cannot be added afterwards, see AutoFolio.get_cs())
+        '''
+
+        try:
+            selector = cs.get_hyperparameter("selector")
+        except KeyError:
+            selector = CategoricalHyperparameter(
+                "selector", choices=["CostSensitiveClassifier"], default="CostSensitiveClassifier")
+            cs.add_hyperparameter(selector)
+
+    def __init__(self, classifier_class, fast_predict: bool=False):
+        '''
+            Constructor
+
+            Arguments
+            ---------
+            classifier_class: selector.classifier.*
+                class for classification
+            fast_predict: bool
+                predict without the input validation of the classifier
+                (see RandomForest.predict_fast())
+        '''
+        self.classifier = None
+        self.logger = logging.getLogger("CostSensitiveClassifier")
+        self.classifier_class = classifier_class
+        self.fast_predict = fast_predict
+
+    def fit(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            fit multi-class classifier to ASlib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        self.logger.info("Fit CostSensitiveClassifier with %s" %
+                         (self.classifier_class))
+
+        self.algorithms = scenario.algorithms
+
+        X = np.asarray(scenario.feature_data.values, dtype=np.float32)
+        perf = scenario.performance_data[scenario.algorithms].values
+        y = np.argmin(perf, axis=1)
+        best = perf[np.arange(perf.shape[0]), y]
+        # mean regret of the other algorithms
+        # (as the weights of PairwiseClassifier in the unit of the performance)
+        n_algos = len(scenario.algorithms)
+        weights = (perf.sum(axis=1) - n_algos * best) / max(n_algos - 1, 1)
+        if weights.sum() > 0:
+            weights /= weights.mean()
+        else:
+            # all algorithms perform the same on all instances
+            weights = np.ones(perf.shape[0])
+
+        self.classifier = self.classifier_class()
+        self.classifier.fit(X, y, config, weights)
+
+    def predict(self, scenario: ASlibScenario):
+        '''
+            transform ASLib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+
+            Returns
+            -------
+                schedule: {inst -> (solver, time)}
+                    schedule of solvers with a running time budget
+        '''
+
+        if scenario.algorithm_cutoff_time:
+            cutoff = scenario.algorithm_cutoff_time
+        else:
+            cutoff = 2**31
+
+        X = np.asarray(scenario.feature_data.values, dtype=np.float32)
+        if getattr(self, "fast_predict", False) and hasattr(self.classifier, "predict_fast"):
+            algo_indx = self.classifier.predict_fast(X)
+        else:
+            algo_indx = self.classifier.predict(X)
+
+        schedules = dict((str(inst), [s]) for s, inst in zip(
+            [(scenario.algorithms[i], cutoff + 1) for i in algo_indx], scenario.feature_data.index))
+        return schedules
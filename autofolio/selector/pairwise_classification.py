@@ -1,10 +1,12 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 
 from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
     UniformFloatHyperparameter, UniformIntegerHyperparameter
+from ConfigSpace.conditions import InCondition
 from ConfigSpace.configuration_space import ConfigurationSpace
 from ConfigSpace import Configuration
 
@@ -16,27 +18,69 @@ __license__ = "BSD"
 
 class PairwiseClassifier(object):
 
+    # the compiled classifiers are evaluated together for at most this number of instances;
+    # for more instances, the per-classifier predictions are faster
+    COMPILED_MAX_INSTANCES = 32
+
     @staticmethod
     def add_params(cs: ConfigurationSpace):
         '''
-            adds parameters to ConfigurationSpace 
+            adds parameters to ConfigurationSpace;
+            an existing "selector" hyperparameter has to include "PairwiseClassifier" as choice
+            (choices cannot be added afterwards, see AutoFolio.get_cs())
         '''
 
         try:
             selector = cs.get_hyperparameter("selector")
-            selector.choices.append("PairwiseClassifier")
         except KeyError:
             selector = CategoricalHyperparameter(
                 "selector", choices=["PairwiseClassifier"], default="PairwiseClassifier")
             cs.add_hyperparameter(selector)
 
-    def __init__(self, classifier_class):
+        prune = CategoricalHyperparameter(
+            "pairwise:prune", choices=[True, False], default=False)
+        cs.add_hyperparameter(prune)
+        prune_threshold = UniformFloatHyperparameter(
+            "pairwise:prune_threshold", lower=0.9, upper=1.0, default=0.99)
+        cs.add_hyperparameter(prune_threshold)
+
+        cond = InCondition(
+            child=prune, parent=selector, values=["PairwiseClassifier"])
+        cs.add_condition(cond)
+        cond = InCondition(
+            child=prune_threshold, parent=prune, values=[True])
+        cs.add_condition(cond)
+
+    def __init__(self, classifier_class, n_jobs: int=1, fast_predict: bool=False, tournament: bool=False):
         '''
             Constructor
+
+            Arguments
+            ---------
+            classifier_class: selector.classifier.*
+                class for classification
+            n_jobs: int
+                number of threads to fit the pairwise classifiers
+            fast_predict: bool
+                predict without the input validation of the classifiers
+                (see get_pairwise_predictions())
+            tournament: bool
+                predict() evaluates the pairwise classifiers adaptively
+                and stops as soon as the selection is decided (see predict_tournament())
         '''
         self.classifiers = []
+        # all classifiers compiled for one batched evaluation (see get_pairwise_predictions())
+        self.compiled_batch = None
+        # per pair: -1 if classified, else constant vote (1: first algorithm wins);
+        # pairs with constant votes have no classifier (None)
+        self.constant_votes = None
         self.logger = logging.getLogger("PairwiseClassifier")
         self.classifier_class = classifier_class
+        self.n_jobs = n_jobs
+        self.fast_predict = fast_predict
+        self.tournament = tournament
+        # number of evaluated classifiers per instance in the last predict_tournament()
+        self.n_evaluations = None
 
     def fit(self, scenario: ASlibScenario, config: Configuration):
         '''
@@ -57,16 +101,108 @@ class PairwiseClassifier(object):
         self.algorithms = scenario.algorithms
 
         n_algos = len(scenario.algorithms)
-        X = scenario.feature_data.values
-        for i in range(n_algos):
-            for j in range(i + 1, n_algos):
-                y_i = scenario.performance_data[scenario.algorithms[i]].values
-                y_j = scenario.performance_data[scenario.algorithms[j]].values
-                y = y_i < y_j
-                weights = np.abs(y_i - y_j)
-                clf = self.classifier_class()
-                clf.fit(X, y, config, weights)
-                self.classifiers.append(clf)
+        # converted once to the dtype of sklearn's trees and shared by all threads
+        X = np.asarray(scenario.feature_data.values, dtype=np.float32)
+        perf = scenario.performance_data[scenario.algorithms].values
+        pairs = [(i, j) for i in range(n_algos) for j in range(i + 1, n_algos)]
+
+        if config.get("pairwise:prune"):
+            self.constant_votes = self._get_constant_votes(
+                perf, pairs, config.get("pairwise:prune_threshold"))
+            self.logger.info("Pruned pairs (constant votes): %d / %d" % (
+                (self.constant_votes >= 0).sum(), len(pairs)))
+        else:
+            self.constant_votes = np.full(len(pairs), -1)
+        self.compiled_batch = None
+
+        def fit_pair(k):
+            i, j = pairs[k]
+            if self.constant_votes[k] >= 0:
+                return None
+            y_i = perf[:, i]
+            y_j = perf[:, j]
+            y = y_i < y_j
+            weights = np.abs(y_i - y_j)
+            clf = self.classifier_class()
+            clf.fit(X, y, config, weights)
+            return clf
+
+        # each classifier has a fixed seed, so the models do not depend on n_jobs
+        if self.n_jobs == 1 or len(pairs) < 2:
+            self.classifiers = list(map(fit_pair, range(len(pairs))))
+        else:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+                self.classifiers = list(pool.map(fit_pair, range(len(pairs))))
+
+    @staticmethod
+    def _get_constant_votes(perf, pairs: list, threshold: float):
+        '''
+            finds pairs which need no classifier:
+            one algorithm is strictly better on at least a threshold fraction
+            of the instances without ties (dominance)
+            or both algorithms perform nearly the same (relative difference below 1%)
+            on at least a threshold fraction of the instances (near duplicates);
+            the vote of such a pair is constant: the dominating algorithm
+            or the algorithm with the larger total advantage.
+            Ties are ignored as in fit() (where their sample weight is 0),
+            so the votes do not depend on the order of the algorithms.
+
+            Arguments
+            ---------
+            perf: numpy.array
+                instances x algorithms performance matrix (minimized)
+            pairs: list
+                pairs of algorithm indices
+            threshold: float
+                fraction of instances
+
+            Returns
+            -------
+            numpy.array
+                per pair: -1 or constant vote (1: first algorithm wins, 0: second algorithm wins)
+        '''
+        votes = np.full(len(pairs), -1)
+        for k, (i, j) in enumerate(pairs):
+            y_i = perf[:, i]
+            y_j = perf[:, j]
+            wins_i = y_i < y_j
+            wins_j = y_j < y_i
+            n_wins = wins_i.sum() + wins_j.sum()
+            if n_wins and wins_i.sum() >= threshold * n_wins:
+                votes[k] = 1
+            elif n_wins and wins_j.sum() >= threshold * n_wins:
+                votes[k] = 0
+            else:
+                diff = np.abs(y_i - y_j)
+                same = diff <= 0.01 * np.maximum(np.abs(y_i), np.abs(y_j))
+                if same.mean() >= threshold:
+                    votes[k] = int(diff[wins_i].sum() > diff[wins_j].sum())
+        return votes
+
+    def _predict_pair(self, k: int, X):
+        '''
+            returns the predictions of the k-th pair
+            (constant votes, see _get_constant_votes(), need no classifier)
+
+            Arguments
+            ---------
+            k: int
+                index of the pair
+            X: numpy.array
+                instance feature matrix
+
+            Returns
+            -------
+            numpy.array
+                boolean vector: first algorithm of the pair wins
+        '''
+        constant_votes = getattr(self, "constant_votes", None)
+        if constant_votes is not None and constant_votes[k] >= 0:
+            return np.full(X.shape[0], constant_votes[k] == 1)
+        clf = self.classifiers[k]
+        if getattr(self, "fast_predict", False) and hasattr(clf, "predict_fast"):
+            return clf.predict_fast(X) == 1
+        return clf.predict(X) == 1
 
     def predict(self, scenario: ASlibScenario):
         '''
@@ -88,17 +224,18 @@ class PairwiseClassifier(object):
         else:
             cutoff = 2**31
 
+        if getattr(self, "tournament", False):
+            return self.predict_tournament(scenario)
+
         n_algos = len(scenario.algorithms)
         X = scenario.feature_data.values
-        scores = np.zeros((X.shape[0], n_algos))
-        clf_indx = 0
-        for i in range(n_algos):
-            for j in range(i + 1, n_algos):
-                clf = self.classifiers[clf_indx]
-                Y = clf.predict(X)
-                scores[Y == 1, i] += 1
-                scores[Y == 0, j] += 1
-                clf_indx += 1
+        Y = self.get_pairwise_predictions(X)
+
+        # winner of each pair: i if Y == 1 else j; tallied in one scatter
+        pairs_i, pairs_j = np.triu_indices(n_algos, k=1)
+        winners = np.where(Y == 1, pairs_i, pairs_j)
+        winners += np.arange(X.shape[0])[:, None] * n_algos
+        scores = np.bincount(winners.ravel(), minlength=X.shape[0] * n_algos).reshape(X.shape[0], n_algos)
 
         #self.logger.debug(
         #   sorted(list(zip(scenario.algorithms, scores)), key=lambda x: x[1], reverse=True))
@@ -107,3 +244,242 @@ class PairwiseClassifier(object):
         schedules = dict((str(inst),[s]) for s,inst in zip([(scenario.algorithms[i], cutoff+1) for i in algo_indx], scenario.feature_data.index))
         #self.logger.debug(schedules)
         return schedules
+
+    def predict_tournament(self, scenario: ASlibScenario):
+        '''
+            selects algorithms as predict() but evaluates the pairwise classifiers
+            of an instance one after another, each time the unevaluated pair of the two
+            algorithms with the most reachable votes, until no algorithm can overtake
+            the leader anymore; the selections are the same as with all votes.
+            The number of evaluated classifiers per instance is saved in self.n_evaluations.
+            Classifiers are called once per round for all instances choosing them,
+            so this mode pays off for few instances (e.g., single predictions) and large portfolios.
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+
+            Returns
+            -------
+                schedule: {inst -> (solver, time)}
+                    schedule of solvers with a running time budget
+        '''
+        if scenario.algorithm_cutoff_time:
+            cutoff = scenario.algorithm_cutoff_time
+        else:
+            cutoff = 2**31
+
+        n_algos = len(scenario.algorithms)
+        X = scenario.feature_data.values
+        if getattr(self, "fast_predict", False):
+            X = np.asarray(X, dtype=np.float32)
+        n_insts = X.shape[0]
+        pairs_i, pairs_j = np.triu_indices(n_algos, k=1)
+
+        wins = np.zeros((n_insts, n_algos), dtype=int)
+        open_votes = np.full((n_insts, n_algos), n_algos - 1, dtype=int)
+        evaluated = np.zeros((n_insts, len(pairs_i)), dtype=bool)
+        algo_indx = np.zeros(n_insts, dtype=int)
+
+        # constant votes are known without evaluation
+        constant_votes = getattr(self, "constant_votes", None)
+        if constant_votes is None:
+            constant_votes = np.full(len(pairs_i), -1)
+        for k in np.flatnonzero(constant_votes >= 0):
+            winner = pairs_i[k] if constant_votes[k] == 1 else pairs_j[k]
+            wins[:, winner] += 1
+            open_votes[:, pairs_i[k]] -= 1
+            open_votes[:, pairs_j[k]] -= 1
+            evaluated[:, k] = True
+
+        undecided = np.arange(n_insts)
+        while len(undecided):
+            max_wins = wins[undecided] + open_votes[undecided]
+            decided, leader = self._get_decided(wins[undecided], max_wins)
+            algo_indx[undecided[decided]] = leader[decided]
+            undecided, max_wins = undecided[~decided], max_wins[~decided]
+            if not len(undecided):
+                break
+
+            # most informative pair: the two strongest algorithms not compared yet
+            priority = max_wins[:, pairs_i] + max_wins[:, pairs_j]
+            priority[evaluated[undecided]] = -1
+            chosen = np.argmax(priority, axis=1)
+            for k in np.unique(chosen):
+                rows = undecided[chosen == k]
+                Y = self._predict_pair(k, X[rows])
+                i, j = pairs_i[k], pairs_j[k]
+                wins[rows[Y], i] += 1
+                wins[rows[~Y], j] += 1
+                open_votes[rows, i] -= 1
+                open_votes[rows, j] -= 1
+                evaluated[rows, k] = True
+
+        # constant votes are no classifier evaluations
+        evaluated[:, constant_votes >= 0] = False
+        n_evaluations = evaluated.sum(axis=1)
+        self.logger.info("Evaluated classifiers per instance: %.2f of %d" % (
+            n_evaluations.mean(), len(pairs_i)))
+
+        insts = [str(inst) for inst in scenario.feature_data.index]
+        self.n_evaluations = dict(zip(insts, n_evaluations))
+        schedules = dict((inst, [(scenario.algorithms[i], cutoff + 1)]) for inst, i in zip(insts, algo_indx))
+        return schedules
+
+    def get_pairwise_predictions(self, X):
+        '''
+            returns the predictions of all pairwise classifiers
+            (in the order of np.triu_indices(len(self.algorithms), k=1));
+            if self.fast_predict, the feature matrix is converted once
+            and the classifiers skip their input validation (if supported);
+            for few instances, they are compiled and evaluated together
+            (see RandomForest.compile_batch())
+
+            Arguments
+            ---------
+            X: numpy.array
+                instance feature matrix
+
+            Returns
+            -------
+            numpy.array
+                instances x pairs
+        '''
+        Y = np.empty((X.shape[0], len(self.classifiers)), dtype=bool)
+        if getattr(self, "fast_predict", False):
+            X = np.asarray(X, dtype=np.float32)
+            classified = [k for k, clf in enumerate(self.classifiers) if clf is not None]
+            if classified and X.shape[0] <= self.COMPILED_MAX_INSTANCES and \
+                    hasattr(self.classifiers[classified[0]], "compile_batch"):
+                if getattr(self, "compiled_batch", None) is None:
+                    self.compiled_batch = self.classifiers[classified[0]].compile_batch(
+                        [self.classifiers[k] for k in classified])
+                Y[:, classified] = self.classifiers[classified[0]].predict_batch(
+                    self.compiled_batch, X) == 1
+                for k in set(range(len(self.classifiers))).difference(classified):
+                    Y[:, k] = self._predict_pair(k, X)
+                return Y
+        for k in range(len(self.classifiers)):
+            Y[:, k] = self._predict_pair(k, X)
+        return Y
+
+    def predict_progressive(self, scenario: ASlibScenario, known_features: list):
+        '''
+            selects algorithms while features become known step by step;
+            the selection of an instance is returned as soon as
+            the remaining features cannot change it (see predict_partial());
+            with all features known, the selections are the same as of predict()
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+            known_features: list
+                boolean vectors: which features are known after each step;
+                the last one should mark all features as known
+
+            Returns
+            -------
+                schedule: {inst -> (solver, time)}
+                    schedule of solvers with a running time budget
+                n_steps: {inst -> int}
+                    index of the first entry of known_features deciding the selection
+        '''
+        if scenario.algorithm_cutoff_time:
+            cutoff = scenario.algorithm_cutoff_time
+        else:
+            cutoff = 2**31
+
+        X = scenario.feature_data.values
+        algo_indx = np.zeros(X.shape[0], dtype=int)
+        n_steps = np.full(X.shape[0], len(known_features) - 1)
+        undecided = np.arange(X.shape[0])
+        for step, known in enumerate(known_features):
+            decided, indx = self.predict_partial(X[undecided], known)
+            algo_indx[undecided[decided]] = indx[decided]
+            n_steps[undecided[decided]] = step
+            undecided = undecided[~decided]
+            if not len(undecided):
+                break
+        if len(undecided):
+            self.logger.warn("Selection of %d instances not decided with all features" % (len(undecided)))
+            algo_indx[undecided] = indx[~decided]
+
+        insts = [str(inst) for inst in scenario.feature_data.index]
+        schedules = dict((inst, [(scenario.algorithms[i], cutoff + 1)]) for inst, i in zip(insts, algo_indx))
+        return schedules, dict(zip(insts, n_steps))
+
+    def predict_partial(self, X, known):
+        '''
+            selects algorithms for instances of which only some features are known;
+            the selection of an instance is decided if the algorithm with the most
+            decided votes cannot be overtaken by the votes of undecided classifiers
+            (ties broken by algorithm order as in predict())
+
+            Arguments
+            ---------
+            X: numpy.array
+                instance feature matrix; values of unknown features are ignored
+            known: numpy.array
+                boolean vector: which features are known
+
+            Returns
+            -------
+            numpy.array
+                boolean vector: selection of the instance is decided
+            numpy.array
+                index of the selected algorithm per instance (only meaningful if decided)
+        '''
+        n_algos = len(self.algorithms)
+        min_scores = np.zeros((X.shape[0], n_algos))
+        max_scores = np.zeros((X.shape[0], n_algos))
+        clf_indx = 0
+        for i in range(n_algos):
+            for j in range(i + 1, n_algos):
+                clf = self.classifiers[clf_indx]
+                if clf is None:
+                    decided, Y = np.ones(X.shape[0], dtype=bool), self._predict_pair(clf_indx, X)
+                elif hasattr(clf, "predict_bounds"):
+                    decided, Y = clf.predict_bounds(X, known)
+                elif known.all():
+                    decided, Y = np.ones(X.shape[0], dtype=bool), clf.predict(X)
+                else:
+                    decided, Y = np.zeros(X.shape[0], dtype=bool), np.zeros(X.shape[0])
+                min_scores[decided & (Y == 1), i] += 1
+                min_scores[decided & (Y == 0), j] += 1
+                max_scores[~decided | (Y == 1), i] += 1
+                max_scores[~decided | (Y == 0), j] += 1
+                clf_indx += 1
+
+        return self._get_decided(min_scores, max_scores)
+
+    @staticmethod
+    def _get_decided(min_scores, max_scores):
+        '''
+            checks whether the algorithm with the most (certain) votes
+            can still be overtaken by another algorithm
+            (ties broken by algorithm order as in predict())
+
+            Arguments
+            ---------
+            min_scores: numpy.array
+                instances x algorithms: certain votes
+            max_scores: numpy.array
+                instances x algorithms: certain plus open votes
+
+            Returns
+            -------
+            numpy.array
+                boolean vector: selection of the instance is decided
+            numpy.array
+                index of the leading algorithm per instance
+        '''
+        n_insts, n_algos = min_scores.shape
+        algo_indx = np.argmax(min_scores, axis=1)
+        best = min_scores[np.arange(n_insts), algo_indx]
+        # algorithms before the leader win ties
+        before = np.arange(n_algos)[None, :] < algo_indx[:, None]
+        threat = np.where(before, max_scores >= best[:, None], max_scores > best[:, None])
+        threat[np.arange(n_insts), algo_indx] = False
+        return ~threat.any(axis=1), algo_indx
@@ -0,0 +1,120 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ConfigSpace.hyperparameters import CategoricalHyperparameter
+from ConfigSpace.configuration_space import ConfigurationSpace
+from ConfigSpace import Configuration
+
+from autofolio.data.aslib_scenario import ASlibScenario
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class PerAlgorithmRegressor(object):
+    '''
+        predicts the performance of each algorithm with its own regression model
+        (log10 of the running time for runtime scenarios)
+        and selects the algorithm with the best predicted performance;
+        in contrast to PairwiseClassifier, the number of models
+        grows linearly with the number of algorithms
+    '''
+
+    @staticmethod
+    def add_params(cs: ConfigurationSpace):
+        '''
+            adds parameters to ConfigurationSpace;
+            an existing "selector" hyperparameter has to include "PerAlgorithmRegressor" as choice
+            (choices cannot be added afterwards, see AutoFolio.get_cs())
+        '''
+
+        try:
+            selector = cs.get_hyperparameter("selector")
+        except KeyError:
+            selector = CategoricalHyperparameter(
+                "selector", choices=["PerAlgorithmRegressor"], default="PerAlgorithmRegressor")
+            cs.add_hyperparameter(selector)
+
+    def __init__(self, regressor_class, n_jobs: int=1):
+        '''
+            Constructor
+
+            Arguments
+            ---------
+            regressor_class: selector.regressors.*
+                class for regression
+            n_jobs: int
+                number of threads to fit the regressors
+        '''
+        self.regressors = []
+        self.logger = logging.getLogger("PerAlgorithmRegressor")
+        self.regressor_class = regressor_class
+        self.n_jobs = n_jobs
+        self.log_transform = False
+
+    def fit(self, scenario: ASlibScenario, config: Configuration):
+        '''
+            fit one regressor per algorithm to ASlib scenario data
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+            config: ConfigSpace.Configuration
+                configuration
+        '''
+        self.logger.info("Fit PerAlgorithmRegressor with %s" %
+                         (self.regressor_class))
+
+        self.algorithms = scenario.algorithms
+        self.log_transform = scenario.performance_type[0] == "runtime"
+
+        # converted once to the dtype of sklearn's trees and shared by all threads
+        X = np.asarray(scenario.feature_data.values, dtype=np.float32)
+        perf = scenario.performance_data[scenario.algorithms].values
+        if self.log_transform:
+            # running times of 0 are possible
+            perf = np.log10(np.maximum(perf, 0.005))
+
+        def fit_algo(i):
+            reg = self.regressor_class()
+            reg.fit(X, perf[:, i], config)
+            return reg
+
+        # each regressor has a fixed seed, so the models do not depend on n_jobs
+        if self.n_jobs == 1 or len(self.algorithms) < 2:
+            self.regressors = list(map(fit_algo, range(len(self.algorithms))))
+        else:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+                self.regressors = list(pool.map(fit_algo, range(len(self.algorithms))))
+
+    def predict(self, scenario: ASlibScenario):
+        '''
+            predict the performance of all algorithms and select the best one
+
+            Arguments
+            ---------
+            scenario: data.aslib_scenario.ASlibScenario
+                ASlib Scenario with all data in pandas
+
+            Returns
+            -------
+                schedule: {inst -> (solver, time)}
+                    schedule of solvers with a running time budget
+        '''
+
+        if scenario.algorithm_cutoff_time:
+            cutoff = scenario.algorithm_cutoff_time
+        else:
+            cutoff = 2**31
+
+        X = np.asarray(scenario.feature_data.values, dtype=np.float32)
+        # instances x algorithms (log10 for runtime scenarios, which keeps the argmin)
+        Y = np.column_stack([reg.predict(X) for reg in self.regressors])
+        algo_indx = np.argmin(Y, axis=1)
+
+        schedules = dict((str(inst), [s]) for s, inst in zip(
+            [(scenario.algorithms[i], cutoff + 1) for i in algo_indx], scenario.feature_data.index))
+        return schedules
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
+    UniformFloatHyperparameter, UniformIntegerHyperparameter
+from ConfigSpace.conditions import EqualsCondition, InCondition
+from ConfigSpace.configuration_space import ConfigurationSpace
+from ConfigSpace import Configuration
+
+from autofolio.data.aslib_scenario import ASlibScenario
+
+from sklearn.ensemble import RandomForestRegressor as SKRandomForestRegressor
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class RandomForestRegressor(object):
+
+    @staticmethod
+    def add_params(cs: ConfigurationSpace):
+        '''
+            adds parameters to ConfigurationSpace;
+            an existing "regressor" hyperparameter has to include "RandomForestRegressor" as choice
+            (choices cannot be added afterwards, see AutoFolio.get_cs())
+        '''
+        try:
+            regressor = cs.get_hyperparameter("regressor")
+        except KeyError:
+            regressor = CategoricalHyperparameter(
+                "regressor", choices=["RandomForestRegressor"], default="RandomForestRegressor")
+            cs.add_hyperparameter(regressor)
+
+        n_estimators = UniformIntegerHyperparameter(
+            name="rfreg:n_estimators", lower=10, upper=100, default=10, log=True)
+        cs.add_hyperparameter(n_estimators)
+        max_features = CategoricalHyperparameter(
+            name="rfreg:max_features", choices=["sqrt", "log2", None], default="sqrt")
+        cs.add_hyperparameter(max_features)
+        max_depth = UniformIntegerHyperparameter(
+            name="rfreg:max_depth", lower=10, upper=2**31, default=2**31, log=True)
+        cs.add_hyperparameter(max_depth)
+        min_samples_split = UniformIntegerHyperparameter(
+            name="rfreg:min_samples_split", lower=2, upper=100, default=2, log=True)
+        cs.add_hyperparameter(min_samples_split)
+        min_samples_leaf = UniformIntegerHyperparameter(
+            name="rfreg:min_samples_leaf", lower=2, upper=100, default=10, log=True)
+        cs.add_hyperparameter(min_samples_leaf)
+        bootstrap = CategoricalHyperparameter(
+            name="rfreg:bootstrap", choices=[True, False], default=True)
+        cs.add_hyperparameter(bootstrap)
+
+        cond = InCondition(
+            child=n_estimators, parent=regressor, values=["RandomForestRegressor"])
+        cs.add_condition(cond)
+        cond = InCondition(
+            child=max_features, parent=regressor, values=["RandomForestRegressor"])
+        cs.add_condition(cond)
+        cond = InCondition(
+            child=max_depth, parent=regressor, values=["RandomForestRegressor"])
+        cs.add_condition(cond)
+        cond = InCondition(
+            child=min_samples_split, parent=regressor, values=["RandomForestRegressor"])
+        cs.add_condition(cond)
+        cond = InCondition(
+            child=min_samples_leaf, parent=regressor, values=["RandomForestRegressor"])
+        cs.add_condition(cond)
+        cond = InCondition(
+            child=bootstrap, parent=regressor, values=["RandomForestRegressor"])
+        cs.add_condition(cond)
+
+    def __init__(self, n_jobs: int=1):
+        '''
+            Constructor
+
+            Arguments
+            ---------
+            n_jobs: int
+                number of threads to build the trees (n_jobs of sklearn's RandomForestRegressor);
+                predictions are sequential;
+                keep it at 1 if several forests are fitted in parallel
+                (see AutoFolio._get_tree_n_jobs())
+        '''
+
+        self.model = None
+        self.n_jobs = n_jobs
+
+    def __str__(self):
+        return "RandomForestRegressor"
+
+    def fit(self, X, y, config: Configuration, weights=None):
+        '''
+            fit random forest regressor
+
+            Arguments
+            ---------
+            X: numpy.array
+                feature matrix
+            y: numpy.array
+                target vector
+            weights: numpy.array
+                vector with sample weights
+            config: ConfigSpace.Configuration
+                configuration
+
+        '''
+
+        self.model = SKRandomForestRegressor(n_estimators=config["rfreg:n_estimators"],
+                                             max_features=config[
+                                                 "rfreg:max_features"],
+                                             max_depth=config["rfreg:max_depth"],
+                                             min_samples_split=config[
+                                                 "rfreg:min_samples_split"],
+                                             min_samples_leaf=config[
+                                                 "rfreg:min_samples_leaf"],
+                                             bootstrap=config["rfreg:bootstrap"],
+                                             n_jobs=self.n_jobs,
+                                             random_state=12345)
+        self.model.fit(X, y, weights)
+        # threads only for building the trees (see RandomForest.fit())
+        self.model.set_params(n_jobs=1)
+
+    def predict(self, X):
+        '''
+            predict targets
+
+            Arguments
+            ---------
+            X: numpy.array
+                instance feature matrix
+
+            Returns
+            -------
+            numpy.array
+                predicted target vector
+        '''
+
+        return self.model.predict(X)
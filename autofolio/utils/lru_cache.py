@@ -0,0 +1,127 @@
+import logging
+import threading
+from collections import OrderedDict
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class LRUCache(object):
+    '''
+        least recently used cache with a bound on the memory
+        of the cached values (as estimated by the caller);
+        safe to use from several threads
+    '''
+
+    def __init__(self, max_bytes: int):
+        '''
+            Constructor
+
+            Arguments
+            ---------
+            max_bytes: int
+                maximal sum of the sizes of all cached values;
+                least recently used values are evicted to respect it
+        '''
+        self.logger = logging.getLogger("LRUCache")
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (value, size in bytes); most recently used at the end
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        '''
+            returns the cached value of key and marks it as most recently used
+
+            Arguments
+            ---------
+            key: hashable
+                key of value
+            default: object
+                returned if key is not cached
+
+            Returns
+            -------
+            object
+                cached value or default
+        '''
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, nbytes: int):
+        '''
+            caches value under key and
+            evicts least recently used values if necessary;
+            values larger than max_bytes are not cached
+
+            Arguments
+            ---------
+            key: hashable
+                key of value
+            value: object
+                value to cache
+            nbytes: int
+                size of value in bytes
+        '''
+        with self._lock:
+            self.pop(key)
+            if nbytes > self.max_bytes:
+                self.logger.debug("Value too large for cache (%d bytes)" % (nbytes))
+                return
+
+            while self.nbytes + nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._data.popitem(last=False)
+                self.nbytes -= evicted_nbytes
+
+            self._data[key] = (value, nbytes)
+            self.nbytes += nbytes
+
+    def pop(self, key, default=None):
+        '''
+            removes key from the cache
+
+            Arguments
+            ---------
+            key: hashable
+                key of value
+            default: object
+                returned if key is not cached
+
+            Returns
+            -------
+            object
+                cached value or default
+        '''
+        with self._lock:
+            if key not in self._data:
+                return default
+            value, nbytes = self._data.pop(key)
+            self.nbytes -= nbytes
+            return value
+
+    def clear(self):
+        '''
+            removes all cached values
+        '''
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
@@ -1,6 +1,6 @@
 import logging
 
-from autofolio.data.aslib_scenario import ASlibScenario
+from autofolio.data.aslib_scenario import ASlibScenario, RUNSTATUS_CODE
 
 __author__ = "Marius Lindauer"
 __license__ = "BSD"
@@ -22,6 +22,8 @@ class Stats(object):
         self.solved = 0
         self.unsolvable = 0
         self.presolved_feats = 0
+        # feature computation time saved by progressive prediction
+        self.feature_cost_saved = 0.0
 
         self.runtime_cutoff = runtime_cutoff
 
@@ -60,6 +62,8 @@ class Stats(object):
             self.logger.info("PAR10: %.4f" % (par10 / n_samples))
             self.logger.info("Timeouts: %d / %d" % (timeouts, n_samples))
             self.logger.info("Presolved during feature computation: %d / %d" % (self.presolved_feats, n_samples))
+            if self.feature_cost_saved:
+                self.logger.info("Feature cost saved per instance: %.4f" % (self.feature_cost_saved / n_samples))
             self.logger.info("Solved: %d / %d" % (self.solved, n_samples))
             self.logger.info("Unsolvable (%s): %d / %d" % 
                              (rm_string, self.unsolvable, n_samples))
@@ -85,6 +89,7 @@ class Stats(object):
         self.solved += stat.solved
         self.unsolvable += stat.unsolvable
         self.presolved_feats += stat.presolved_feats
+        self.feature_cost_saved += stat.feature_cost_saved
 
 
 class Validator(object):
@@ -93,7 +98,7 @@ class Validator(object):
         ''' Constructor '''
         self.logger = logging.getLogger("Validation")
 
-    def validate_runtime(self, schedules: dict, test_scenario: ASlibScenario):
+    def validate_runtime(self, schedules: dict, test_scenario: ASlibScenario, used_steps: dict=None):
         '''
             validate selected schedules on test instances for runtime
 
@@ -103,6 +108,10 @@ class Validator(object):
                 algorithm schedules per instance
             test_scenario: ASlibScenario
                 ASlib scenario with test instances
+            used_steps: dict {instance name -> list of feature steps}
+                feature steps computed per instance (e.g., by progressive prediction);
+                if None, all used feature groups of the test scenario;
+                the cost of the other used feature groups is counted as saved
         '''
         if test_scenario.performance_type[0] != "runtime":
             raise ValueError("Cannot validate non-runtime scenario with runtime validation method")
@@ -117,8 +126,11 @@ class Validator(object):
 
         feature_stati = test_scenario.feature_runstatus_data[
             test_scenario.used_feature_groups]
+        # instances presolved by any of the used feature steps
+        presolved_insts = dict(zip(feature_stati.index,
+                                   (feature_stati.values == RUNSTATUS_CODE["presolved"]).any(axis=1)))
 
-        ok_status = test_scenario.runstatus_data == "ok"
+        ok_status = test_scenario.runstatus_data.values == RUNSTATUS_CODE["ok"]
         unsolvable = ok_status.sum(axis=1) == 0
         stat.unsolvable += unsolvable.sum()
 
@@ -129,11 +141,14 @@ class Validator(object):
                 used_time += f_times[inst]
                 self.logger.debug("Used Feature time: %f" % (used_time))
 
-            presolved = False
-            for fg in test_scenario.used_feature_groups:
-                if "presolved" in feature_stati[fg][inst]:
-                    presolved = True
-                    break
+            if used_steps is not None:
+                steps = used_steps[inst]
+                if feature_times:
+                    used_time = test_scenario.feature_cost_data.loc[inst, steps].sum()
+                    stat.feature_cost_saved += f_times[inst] - used_time
+                presolved = (feature_stati.loc[inst, steps].values == RUNSTATUS_CODE["presolved"]).any()
+            else:
+                presolved = presolved_insts[inst]
 
             if presolved and used_time < test_scenario.algorithm_cutoff_time:
                 stat.par1 += used_time
@@ -149,7 +164,7 @@ class Validator(object):
             for algo, budget in schedule:
                 time = test_scenario.performance_data[algo][inst]
                 used_time += min(time, budget)
-                if time <= budget and used_time <= test_scenario.algorithm_cutoff_time and test_scenario.runstatus_data[algo][inst] == "ok":
+                if time <= budget and used_time <= test_scenario.algorithm_cutoff_time and test_scenario.runstatus_data[algo][inst] == RUNSTATUS_CODE["ok"]:
                     stat.par1 += used_time
                     stat.solved += 1
                     self.logger.debug("Solved by %s (budget: %f -- required to solve: %f)" % (algo, budget, time))
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from autofolio.io.arff_reader import ARFFReader, ARFFError
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+HEADER = '''@RELATION test
+@ATTRIBUTE instance_id STRING
+@ATTRIBUTE repetition NUMERIC
+@ATTRIBUTE status {ok, timeout}
+@DATA
+'''
+
+
+class TestARFFReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def read(self, data: str):
+        fn = os.path.join(self.tmp_dir, "test.arff")
+        with open(fn, "w") as fp:
+            fp.write(HEADER + data)
+        with ARFFReader(fn) as reader:
+            return reader.read_data()
+
+    def test_quotes_and_whitespace(self):
+        '''
+            single- and double-quoted values as well as whitespace
+            around values are read as by liac-arff
+        '''
+        data = self.read("'a,1',1,ok\n"
+                         "\"b 'x'\" , 2 , timeout  \n"
+                         "\"c\\\"\",3,ok \n")
+        self.assertEqual(data["instance_id"].tolist(), ["a,1", "b 'x'", "c\""])
+        self.assertEqual(data["repetition"].tolist(), [1, 2, 3])
+        self.assertEqual(data["status"].tolist(), ["ok", "timeout", "ok"])
+
+    def test_bad_nominal_value(self):
+        '''
+            values not declared in the header are rejected
+        '''
+        self.assertRaises(ARFFError, self.read, "a,1,crashed\n")
+
+    def test_wrong_number_of_values(self):
+        '''
+            lines with too few or too many values are rejected instead of padded with NaN
+        '''
+        self.assertRaises(ARFFError, self.read, "a,1,ok\nb,2\n")
+        self.assertRaises(ARFFError, self.read, "a,1,ok\n\"b\" , 2\n")
+        self.assertRaises(ARFFError, self.read, "a,1,ok,ok\n")
+
+    def test_comments_and_line_breaks(self):
+        '''
+            comments, empty lines and Windows line breaks in the data section are skipped
+        '''
+        data = self.read("a,1,ok\r\n\r\n% comment\r\n  \r\nb , 2,timeout\r\nc,3,ok")
+        self.assertEqual(data["instance_id"].tolist(), ["a", "b", "c"])
+        self.assertEqual(data["status"].tolist(), ["ok", "timeout", "ok"])
+        self.assertRaises(ARFFError, self.read, "a,1,ok\n% comment\nb,2\n")
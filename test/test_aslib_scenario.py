@@ -0,0 +1,121 @@
+import gc
+import glob
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from autofolio.data.aslib_scenario import ASlibScenario
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class TestASlibScenario(unittest.TestCase):
+
+    def setUp(self):
+        self.src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.scenario = ASlibScenario()
+        self.scenario.read_scenario(
+            os.path.join(self.src_dir, "examples", "asp-aslib", "data"))
+
+    def test_shared_store_lifetime(self):
+        '''
+            a temporary shared store does not keep the scenario alive
+            and is removed once the scenario is not referenced anymore
+        '''
+        self.scenario.share()
+        shared_dn = self.scenario._shared["dn"]
+        ref = weakref.ref(self.scenario)
+        del self.scenario
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertFalse(os.path.isdir(shared_dn))
+
+    def test_shared_store_splits(self):
+        '''
+            splits keep a temporary shared store alive but never remove it
+        '''
+        self.scenario.share()
+        shared_dn = self.scenario._shared["dn"]
+        test, training = self.scenario.get_split(1)
+        del self.scenario
+        gc.collect()
+
+        test.release_shared()
+        self.assertTrue(os.path.isdir(shared_dn))
+        # splits can still be sent to workers
+        copy = pickle.loads(pickle.dumps(training))
+        self.assertEqual(copy.performance_data.shape, training.performance_data.shape)
+
+        del test, training, copy
+        gc.collect()
+        self.assertFalse(os.path.isdir(shared_dn))
+
+    def test_split_handles(self):
+        '''
+            splits have their own update log and handle of the shared store
+        '''
+        self.scenario.share()
+        test, training = self.scenario.get_split(1)
+        training.updates.append(("instances", ["new"]))
+        self.assertEqual(self.scenario.updates, [])
+        self.assertEqual(test.updates, [])
+
+        self.assertIsNot(training._shared, self.scenario._shared)
+        self.assertFalse(training._shared["owner"])
+        self.scenario.release_shared()
+        self.assertIsNone(self.scenario._shared)
+        self.assertIsNotNone(training._shared)
+
+    def test_cache(self):
+        '''
+            the binary scenario cache restores all data frames;
+            a broken cache is a cache miss
+        '''
+        cache_dn = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dn)
+        scenario_dn = os.path.join(self.src_dir, "examples", "asp-aslib", "data")
+        ASlibScenario().read_scenario(scenario_dn, cache_dn=cache_dn)
+
+        self.assertTrue(ASlibScenario().read_cache(cache_dn, self._get_cache_key(scenario_dn)))
+        cached = ASlibScenario()
+        cached.read_scenario(scenario_dn, cache_dn=cache_dn)
+        for name in ["feature_data", "performance_data", "runstatus_data",
+                     "feature_cost_data", "feature_runstatus_data", "cv_data"]:
+            self.assertTrue(getattr(cached, name).equals(getattr(self.scenario, name)), name)
+        self.assertEqual(cached.features_stochastic, self.scenario.features_stochastic)
+
+        meta_fn = glob.glob(os.path.join(cache_dn, "*", "meta.json"))[0]
+        with open(meta_fn, "w") as fp:
+            fp.write("{\"meta\": ")
+        self.assertFalse(ASlibScenario().read_cache(cache_dn, self._get_cache_key(scenario_dn)))
+
+        # cache was removed and is written again
+        scenario = ASlibScenario()
+        scenario.read_scenario(scenario_dn, cache_dn=cache_dn)
+        self.assertTrue(scenario.feature_data.equals(self.scenario.feature_data))
+        self.assertTrue(os.path.isfile(meta_fn))
+
+    def test_save_frame_objects(self):
+        '''
+            object frames (e.g., ground truth) are restored with their missing values
+        '''
+        dn = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dn)
+        data = pd.DataFrame({"a": ["x", np.nan, "y"], "b": [1.5, "x", np.nan]},
+                            index=["i1", "i2", "i3"], dtype=object)
+        frame_meta = ASlibScenario._save_frame(dn, "data", data)
+        self.assertTrue(ASlibScenario._load_frame(dn, "data", frame_meta).equals(data))
+
+    @staticmethod
+    def _get_cache_key(scenario_dn: str):
+        scenario = ASlibScenario()
+        scenario.dir_ = scenario_dn
+        scenario.find_files()
+        return scenario.get_cache_key()
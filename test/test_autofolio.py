@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from autofolio.data.aslib_scenario import ASlibScenario
+from autofolio.autofolio import AutoFolio
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class TestAutoFolio(unittest.TestCase):
+
+    def setUp(self):
+        self.src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.scenario = ASlibScenario()
+        self.scenario.read_scenario(
+            os.path.join(self.src_dir, "examples", "asp-aslib", "data"))
+
+    def test_get_cs(self):
+        '''
+            all selectors are choices of the configuration space
+        '''
+        cs = AutoFolio().get_cs(self.scenario, {})
+        selector = cs.get_hyperparameter("selector")
+        self.assertEqual(set(selector.choices),
+                         {"PairwiseClassifier", "PerAlgorithmRegressor", "CostSensitiveClassifier"})
+        self.assertEqual(selector.num_choices, 3)
+        self.assertEqual(cs.get_default_configuration()["selector"], "PairwiseClassifier")
+
+    def test_tree_n_jobs(self):
+        '''
+            tree threads are capped by the threads fitting the forests in parallel
+        '''
+        af = AutoFolio()
+        with mock.patch("os.cpu_count", return_value=8):
+            self.assertEqual(af._get_tree_n_jobs(1), 8)
+            self.assertEqual(af._get_tree_n_jobs(4), 1)
+            af.tree_n_jobs = -1
+            self.assertEqual(af._get_tree_n_jobs(4), 2)
+            af.tree_n_jobs = 4
+            self.assertEqual(af._get_tree_n_jobs(3), 2)
+            self.assertEqual(af._get_tree_n_jobs(16), 1)
+            self.assertEqual(af._get_tree_n_jobs(1), 4)
+
+    def test_run_cv_fold_column(self):
+        '''
+            a precomputed 0-based 5-fold column is renumbered to 1..5
+            and run_cv() evaluates exactly these folds
+        '''
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        rng = np.random.RandomState(1)
+        instances = ["inst_%d" % (i) for i in range(100)]
+        features = pd.DataFrame(rng.rand(100, 4), index=instances,
+                                columns=["f%d" % (i) for i in range(4)])
+        features["fold"] = np.arange(100) % 5
+        features.to_csv(os.path.join(tmp_dir, "features.csv"))
+        pd.DataFrame(rng.rand(100, 3), index=instances, columns=["a", "b", "c"]).to_csv(
+            os.path.join(tmp_dir, "perf.csv"))
+
+        scenario = ASlibScenario()
+        scenario.read_from_csv(perf_fn=os.path.join(tmp_dir, "perf.csv"),
+                               feat_fn=os.path.join(tmp_dir, "features.csv"),
+                               objective="solution_quality", runtime_cutoff=None,
+                               maximize=True, fold_column="fold")
+        self.assertEqual(sorted(scenario.cv_data["fold"].unique()), [1, 2, 3, 4, 5])
+        self.assertEqual(list(scenario.cv_data.loc[["inst_0", "inst_4"], "fold"]), [1, 5])
+
+        splits = []
+        get_split = scenario.get_split
+
+        def record_split(indx):
+            splits.append(indx)
+            return get_split(indx=indx)
+        scenario.get_split = record_split
+
+        af = AutoFolio()
+        cs = af.get_cs(scenario, {})
+        af.run_cv(config=cs.get_default_configuration(), scenario=scenario)
+        self.assertEqual(splits, [1, 2, 3, 4, 5])
@@ -0,0 +1,83 @@
+import os
+import logging
+import unittest
+from unittest import mock
+
+from ConfigSpace.configuration_space import ConfigurationSpace
+from ConfigSpace.hyperparameters import CategoricalHyperparameter
+
+from autofolio.autofolio import AutoFolio
+from autofolio.data.aslib_scenario import ASlibScenario
+from autofolio.feature_preprocessing.feature_step_selection import FeatureStepSelection
+from autofolio.feature_preprocessing.feature_group_filtering import FeatureGroupFiltering
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class TestFeatureStepSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.scenario = ASlibScenario()
+        self.scenario.read_scenario(
+            os.path.join(self.src_dir, "examples", "asp-aslib", "data"))
+
+    def test_costly_features(self):
+        '''
+            with very costly features, no features at all (the single best algorithm)
+            has the best estimated PAR10; it must be neither proposed nor a reference for pruning
+        '''
+        self.scenario.feature_cost_data *= 150
+        fss = FeatureStepSelection()
+        self.assertTrue(fss.fit(self.scenario))
+
+        self.assertTrue(fss.default_steps)
+        self.assertIn(frozenset(), fss.dominated)
+        self.assertNotIn(frozenset(fss.default_steps), fss.dominated)
+
+        config = dict(("fgroup_%s" % (step), step in fss.default_steps)
+                      for step in self.scenario.feature_steps)
+        fgf = FeatureGroupFiltering()
+        fgf.fit(self.scenario, config)
+        self.assertTrue(fgf.active_features)
+
+    def test_forbidden_clauses(self):
+        '''
+            one clause per requirement and per (capped) dominated combination;
+            the default configuration is valid
+        '''
+        self.scenario.feature_cost_data *= 150
+        fss = FeatureStepSelection(max_forbiddens=2)
+        self.assertTrue(fss.fit(self.scenario))
+        self.assertEqual(len(fss.dominated), 2)
+        self.assertIn(frozenset(), fss.dominated)
+
+        cs = ConfigurationSpace()
+        for step in self.scenario.feature_steps:
+            cs.add_hyperparameter(CategoricalHyperparameter(
+                "fgroup_%s" % (step), choices=[True, False], default=step in fss.default_steps))
+        fss.add_forbiddens(cs=cs, steps=self.scenario.feature_steps)
+        self.assertEqual(len(cs.forbidden_clauses), len(fss.requirements) + 2)
+        cs.get_default_configuration()
+
+    def test_fold_config(self):
+        '''
+            the feature steps of a cv fold are estimated on its training instances only
+        '''
+        self.scenario.feature_cost_data *= 150
+        test, training = self.scenario.get_split(1)
+        fitted_instances = []
+        fit = FeatureStepSelection.fit
+
+        def record_fit(fss, scenario):
+            fitted_instances.extend(scenario.feature_data.index)
+            return fit(fss, scenario)
+
+        af = AutoFolio()
+        config = af.get_cs(self.scenario).get_default_configuration()
+        with mock.patch.object(FeatureStepSelection, "fit", record_fit):
+            fold_config = af._get_fold_config(training, config)
+        self.assertEqual(sorted(fitted_instances), sorted(training.feature_data.index))
+        self.assertFalse(set(fitted_instances) & set(test.feature_data.index))
+        self.assertTrue(any(fold_config["fgroup_%s" % (step)] for step in self.scenario.feature_steps))
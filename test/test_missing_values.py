@@ -0,0 +1,29 @@
+import unittest
+
+import numpy as np
+
+from autofolio.feature_preprocessing.missing_values import ImputerWrapper
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class TestImputerWrapper(unittest.TestCase):
+
+    def test_partial_fit_bounded_counts(self):
+        '''
+            value counts of partial_fit_array() stay bounded;
+            statistics of features with few distinct values stay exact
+        '''
+        rng = np.random.RandomState(1)
+        X = np.column_stack([rng.randn(5000), rng.randint(0, 20, 5000)])
+        X[rng.rand(*X.shape) < 0.1] = np.nan
+        config = {"imputer_strategy": "median"}
+
+        imputer = ImputerWrapper(max_distinct_values=100)
+        for start in range(0, X.shape[0], 500):
+            imputer.partial_fit_array(X[start:start + 500], config)
+
+        self.assertTrue(all(len(counter) <= 100 for counter in imputer._value_counts))
+        self.assertEqual(imputer.imputer.statistics_[1], np.nanmedian(X[:, 1]))
+        self.assertAlmostEqual(imputer.imputer.statistics_[0], np.nanmedian(X[:, 0]), delta=0.1)
@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from autofolio.selector.pairwise_classification import PairwiseClassifier
+
+__author__ = "Marius Lindauer"
+__license__ = "BSD"
+
+
+class TestPairwiseClassifier(unittest.TestCase):
+
+    def test_constant_votes_ties(self):
+        '''
+            an algorithm which is never worse and strictly better on 5% of the instances
+            dominates independent of the order of the algorithms
+        '''
+        perf = np.array([[10, 5000]] * 50 + [[6000, 6000]] * 950, dtype=float)
+        votes = PairwiseClassifier._get_constant_votes(perf, [(0, 1)], threshold=0.95)
+        self.assertEqual(votes.tolist(), [1])
+        votes = PairwiseClassifier._get_constant_votes(perf[:, ::-1], [(0, 1)], threshold=0.95)
+        self.assertEqual(votes.tolist(), [0])
+
+    def test_constant_votes_only_ties(self):
+        '''
+            identical algorithms need no classifier
+        '''
+        perf = np.array([[5, 5]] * 100, dtype=float)
+        votes = PairwiseClassifier._get_constant_votes(perf, [(0, 1)], threshold=0.95)
+        self.assertIn(votes[0], [0, 1])
+
+    def test_constant_votes_no_dominance(self):
+        perf = np.array([[1, 2]] * 50 + [[2, 1]] * 50, dtype=float)
+        votes = PairwiseClassifier._get_constant_votes(perf, [(0, 1)], threshold=0.95)
+        self.assertEqual(votes.tolist(), [-1])